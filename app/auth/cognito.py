@@ -4,22 +4,29 @@ import logging
 from functools import lru_cache
 from typing import Any, Dict, Optional
 
-import requests
-from requests.auth import HTTPBasicAuth
-from requests.exceptions import HTTPError, RequestException
+import httpx
 
 import boto3
 from botocore.exceptions import ClientError
 
+from app import http_client
+from app.cache import TTLCache
+from app.circuit_breaker import get_breaker
 from app.config import (
+    AUTH_USER_CACHE_FAILURE_TTL_SECONDS,
+    AUTH_USER_CACHE_SIZE,
+    AUTH_USER_CACHE_TTL_SECONDS,
     AWS_REGION,
     COGNITO_APP_CLIENT_ID,
     COGNITO_APP_CLIENT_SECRET,
     COGNITO_AUTH_URL_BASE,
     COGNITO_REDIRECT_URI,
+    COGNITO_TOKEN_TIMEOUT_SECONDS,
     COGNITO_USER_POOL_ID,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
     LOCAL_AUTH_ENABLED,
 )
+from app.metrics import register_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -69,8 +76,29 @@ def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
 
 # ─── FETCH USER ATTRIBUTES ────────────────────────────────────────────────────
 
+# admin_get_user has a low per-account quota, so attributes are cached per
+# username and failures are remembered briefly instead of retried per request.
+user_attributes_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TTL_SECONDS
+)
+_user_attribute_failures = 0
+
+
+def _user_attributes_stats() -> Dict[str, Any]:
+    return {**user_attributes_cache.stats(), "failures": _user_attribute_failures}
+
+
+register_metrics("cognito_user_attributes", _user_attributes_stats)
+
+
 def fetch_user_attributes(username: str) -> Dict[str, Any]:
     """Retrieve a user's attributes from Cognito using their username."""
+    global _user_attribute_failures
+
+    cached = user_attributes_cache.get(username)
+    if cached is not None:
+        return dict(cached)
+
     try:
         resp = get_cognito_client().admin_get_user(
             UserPoolId=_cognito_user_pool_id,
@@ -78,6 +106,10 @@ def fetch_user_attributes(username: str) -> Dict[str, Any]:
         )
     except ClientError:
         logger.exception("Failed to fetch Cognito user attributes")
+        _user_attribute_failures += 1
+        user_attributes_cache.set(
+            username, {}, ttl_seconds=AUTH_USER_CACHE_FAILURE_TTL_SECONDS
+        )
         return {}
 
     attrs = {
@@ -85,101 +117,92 @@ def fetch_user_attributes(username: str) -> Dict[str, Any]:
         for attr in resp.get("UserAttributes", [])  # safe because default is []
     }
     logger.debug("Fetched Cognito user attributes: keys=%s", sorted(attrs))
-    return attrs
+    user_attributes_cache.set(username, attrs)
+    return dict(attrs)
+
+
+def invalidate_user_attributes(username: str) -> None:
+    """Drop cached attributes so the next request reads them from Cognito."""
+    user_attributes_cache.pop(username)
+
 
+# ─── TOKEN ENDPOINT CALLS ─────────────────────────────────────────────────────
 
-# ─── EXCHANGE CODE FOR TOKENS ─────────────────────────────────────────────────
+# Shared by the code exchange and refresh calls; an invalid code or expired
+# refresh token (HTTP 400) does not count as an endpoint failure.
+token_endpoint_breaker = get_breaker("cognito_token_endpoint")
 
-def exchange_code_for_tokens(code: str) -> Dict[str, Any]:
-    """Exchange an OAuth `code` for tokens via Cognito."""
 
-    # Validate imported config values
-    _missing = [
-        name
-        for name, val in [
-            ("COGNITO_AUTH_URL_BASE", COGNITO_AUTH_URL_BASE),
-            ("COGNITO_APP_CLIENT_ID", COGNITO_APP_CLIENT_ID),
-            ("COGNITO_APP_CLIENT_SECRET", COGNITO_APP_CLIENT_SECRET),
-            ("COGNITO_REDIRECT_URI", COGNITO_REDIRECT_URI),
-        ]
-        if not val
+def _token_endpoint(*, need_redirect_uri: bool) -> tuple[str, str, str]:
+    """Return the token URL, client id and client secret, or raise if unset."""
+    required = [
+        ("COGNITO_AUTH_URL_BASE", COGNITO_AUTH_URL_BASE),
+        ("COGNITO_APP_CLIENT_ID", COGNITO_APP_CLIENT_ID),
+        ("COGNITO_APP_CLIENT_SECRET", COGNITO_APP_CLIENT_SECRET),
     ]
+    if need_redirect_uri:
+        required.append(("COGNITO_REDIRECT_URI", COGNITO_REDIRECT_URI))
+    _missing = [name for name, val in required if not val]
     if _missing:
         raise RuntimeError(f"Missing environment variables: {', '.join(_missing)}")
 
-    # Narrow to local str vars
     base_url: str = COGNITO_AUTH_URL_BASE  # type: ignore[assignment]
     client_id_app: str = COGNITO_APP_CLIENT_ID  # type: ignore[assignment]
     client_secret: str = COGNITO_APP_CLIENT_SECRET  # type: ignore[assignment]
-    redirect_uri: str = COGNITO_REDIRECT_URI  # type: ignore[assignment]
+    return base_url.replace("/login", "/oauth2/token"), client_id_app, client_secret
 
-    # Build endpoint & payload
-    token_url = base_url.replace("/login", "/oauth2/token")
-    payload = {
-        "grant_type": "authorization_code",
-        "client_id": client_id_app,
-        "code": code,
-        "redirect_uri": redirect_uri,
-    }
-
-    logger.debug("Exchanging Cognito authorization code")
 
-    resp: requests.Response | None = None
+async def _post_token_request(
+    token_url: str, client_id_app: str, client_secret: str, payload: Dict[str, str], action: str
+) -> Dict[str, Any]:
+    """POST to the Cognito token endpoint without blocking the event loop."""
     try:
-        resp = requests.post(
-            token_url,
-            data=payload,
-            auth=HTTPBasicAuth(client_id_app, client_secret),
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            timeout=10,
-        )
-
-        resp.raise_for_status()
-
-        tokens = resp.json()
-        logger.info("Token exchange succeeded")
-        return tokens
-
-    except HTTPError as http_err:
-        response = http_err.response or resp
-        status_code = response.status_code if response else "N/A"
-
-        logger.error(
-            "HTTPError during token exchange (status=%s): %s",
-            status_code,
-            http_err,
-        )
-        raise
-
-    except RequestException as req_err:
+        with token_endpoint_breaker.guard():
+            resp = await http_client.async_client().post(
+                token_url,
+                data=payload,
+                auth=(client_id_app, client_secret),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=httpx.Timeout(
+                    COGNITO_TOKEN_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS
+                ),
+            )
+            resp.raise_for_status()
+        return resp.json()
+    except httpx.HTTPStatusError as http_err:
         logger.error(
-            "RequestException during token exchange: %s", req_err, exc_info=True
+            "HTTPError during %s (status=%s): %s",
+            action,
+            http_err.response.status_code,
+            http_err,
         )
         raise
+    except httpx.RequestError as req_err:
+        logger.error("RequestException during %s: %s", action, req_err, exc_info=True)
+        raise
 
 
-# ─── REFRESH ACCESS TOKEN ─────────────────────────────────────────────────────
-
-def refresh_access_token(refresh_token: str) -> Dict[str, Any]:
-    """Use a Cognito refresh token to obtain new tokens."""
+async def exchange_code_for_tokens_async(code: str) -> Dict[str, Any]:
+    """Exchange an OAuth `code` for tokens via Cognito without blocking."""
+    token_url, client_id_app, client_secret = _token_endpoint(need_redirect_uri=True)
+    payload = {
+        "grant_type": "authorization_code",
+        "client_id": client_id_app,
+        "code": code,
+        "redirect_uri": COGNITO_REDIRECT_URI or "",
+    }
 
-    _missing = [
-        name
-        for name, val in [
-            ("COGNITO_AUTH_URL_BASE", COGNITO_AUTH_URL_BASE),
-            ("COGNITO_APP_CLIENT_ID", COGNITO_APP_CLIENT_ID),
-            ("COGNITO_APP_CLIENT_SECRET", COGNITO_APP_CLIENT_SECRET),
-        ]
-        if not val
-    ]
-    if _missing:
-        raise RuntimeError(f"Missing environment variables: {', '.join(_missing)}")
+    logger.debug("Exchanging Cognito authorization code")
+    tokens = await _post_token_request(
+        token_url, client_id_app, client_secret, payload, "token exchange"
+    )
+    logger.info("Token exchange succeeded")
+    return tokens
 
-    base_url: str = COGNITO_AUTH_URL_BASE  # type: ignore[assignment]
-    client_id_app: str = COGNITO_APP_CLIENT_ID  # type: ignore[assignment]
-    client_secret: str = COGNITO_APP_CLIENT_SECRET  # type: ignore[assignment]
 
-    token_url = base_url.replace("/login", "/oauth2/token")
+async def refresh_access_token_async(refresh_token: str) -> Dict[str, Any]:
+    """Use a Cognito refresh token to obtain new tokens without blocking."""
+    token_url, client_id_app, client_secret = _token_endpoint(need_redirect_uri=False)
     payload = {
         "grant_type": "refresh_token",
         "client_id": client_id_app,
@@ -187,35 +210,9 @@ def refresh_access_token(refresh_token: str) -> Dict[str, Any]:
     }
 
     logger.debug("Refreshing Cognito access token")
+    tokens = await _post_token_request(
+        token_url, client_id_app, client_secret, payload, "token refresh"
+    )
+    logger.info("Refresh token succeeded")
+    return tokens
 
-    resp: requests.Response | None = None
-    try:
-        resp = requests.post(
-            token_url,
-            data=payload,
-            auth=HTTPBasicAuth(client_id_app, client_secret),
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            timeout=10,
-        )
-
-        resp.raise_for_status()
-        tokens = resp.json()
-        logger.info("Refresh token succeeded")
-        return tokens
-    except HTTPError as http_err:
-        response = http_err.response or resp
-        status_code = response.status_code if response else "N/A"
-        logger.error(
-            "HTTPError during token refresh (status=%s): %s",
-            status_code,
-            http_err,
-        )
-        raise
-    except RequestException as req_err:
-        logger.error(
-            "RequestException during token refresh: %s", req_err, exc_info=True
-        )
-        raise
-    except Exception:
-        logger.error("Unexpected error in refresh_access_token", exc_info=True)
-        raise
@@ -0,0 +1,105 @@
+"""Per-request authentication context shared by middleware, dependencies and routes."""
+
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from fastapi import HTTPException, Request
+from jose import JWTError, jwt
+
+from .cookies import ACCESS_TOKEN_COOKIE, ID_TOKEN_COOKIE, REFRESH_TOKEN_COOKIE
+
+
+class AuthContext:
+    """Credentials and the authenticated user for one request.
+
+    Built once per request by :func:`get_auth_context`. Credentials come from
+    the ``Authorization: Bearer`` header, else the access cookie. The user is
+    resolved on first use and the result (or the ``HTTPException``) is reused
+    by every later caller in the same request. Verified token claims are kept
+    the same way, so a page can verify the token first and then look up the
+    user's attributes alongside its other upstream calls.
+    """
+
+    __slots__ = (
+        "credentials",
+        "from_cookie",
+        "refresh_token",
+        "id_token",
+        "_claims",
+        "_results",
+        "_errors",
+    )
+
+    def __init__(
+        self,
+        credentials: str | None,
+        *,
+        from_cookie: bool,
+        refresh_token: str | None,
+        id_token: str | None = None,
+    ) -> None:
+        self.credentials = credentials
+        self.from_cookie = from_cookie
+        self.refresh_token = refresh_token
+        self.id_token = id_token
+        self._claims: Dict[str, Any] | None = None
+        self._results: Dict[str, Any] = {}
+        self._errors: Dict[str, HTTPException] = {}
+
+    def unverified_claims(self) -> Dict[str, Any]:
+        """Claims read without checking the signature; only for refresh decisions."""
+        if self._claims is None:
+            try:
+                self._claims = jwt.get_unverified_claims(self.credentials or "")
+            except JWTError:
+                self._claims = {}
+        return self._claims
+
+    async def resolve_user(
+        self, authenticate: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Run ``authenticate`` at most once per request and reuse its outcome."""
+        return await self._resolve("user", authenticate)
+
+    async def resolve_claims(
+        self, verify: Callable[[], Awaitable[Tuple[str, Dict[str, Any]]]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Run ``verify`` at most once per request; returns ``(token, claims)``."""
+        return await self._resolve("claims", verify)
+
+    async def _resolve(self, name: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        if name in self._results:
+            return self._results[name]
+        if name in self._errors:
+            raise self._errors[name]
+        try:
+            result = await load()
+        except HTTPException as exc:
+            self._errors[name] = exc
+            raise
+        self._results[name] = result
+        return result
+
+
+def get_auth_context(request: Request) -> AuthContext:
+    """Return this request's :class:`AuthContext`, creating it on first use."""
+    context = getattr(request.state, "auth", None)
+    if context is None:
+        context = _build_context(request)
+        request.state.auth = context
+    return context
+
+
+def _build_context(request: Request) -> AuthContext:
+    refresh_token = request.cookies.get(REFRESH_TOKEN_COOKIE)
+    id_token = request.cookies.get(ID_TOKEN_COOKIE) or None
+    scheme, _, header_token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and header_token:
+        return AuthContext(
+            header_token, from_cookie=False, refresh_token=refresh_token, id_token=id_token
+        )
+    cookie_token = request.cookies.get(ACCESS_TOKEN_COOKIE)
+    return AuthContext(
+        cookie_token or None, from_cookie=True, refresh_token=refresh_token, id_token=id_token
+    )
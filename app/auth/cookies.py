@@ -6,6 +6,7 @@ from app.config import STAGE
 
 ACCESS_TOKEN_COOKIE = "access_token"
 REFRESH_TOKEN_COOKIE = "refresh_token"
+ID_TOKEN_COOKIE = "id_token"
 REFRESH_TOKEN_MAX_AGE = 30 * 24 * 60 * 60
 SAME_SITE = "lax"
 
@@ -28,6 +29,17 @@ def set_access_token_cookie(response: Response, request: Request, token: str) ->
     )
 
 
+def set_id_token_cookie(response: Response, request: Request, token: str) -> None:
+    """Set the ID token cookie with the same attributes as the access token."""
+    response.set_cookie(
+        key=ID_TOKEN_COOKIE,
+        value=token,
+        httponly=True,
+        secure=use_secure_cookies(request),
+        samesite=SAME_SITE,
+    )
+
+
 def set_refresh_token_cookie(response: Response, request: Request, token: str) -> None:
     """Set the refresh token cookie with consistent security attributes."""
     response.set_cookie(
@@ -49,6 +61,12 @@ def delete_auth_cookies(response: Response, request: Request) -> None:
         secure=secure,
         samesite=SAME_SITE,
     )
+    response.delete_cookie(
+        ID_TOKEN_COOKIE,
+        httponly=True,
+        secure=secure,
+        samesite=SAME_SITE,
+    )
     response.delete_cookie(
         REFRESH_TOKEN_COOKIE,
         httponly=True,
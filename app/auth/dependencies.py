@@ -1,18 +1,27 @@
 """Authentication dependencies used across the application."""
 
+import hashlib
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Tuple
 
-import requests
-from functools import lru_cache
 from requests.exceptions import RequestException
-from fastapi import Depends, HTTPException, Request, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwk, jwt
+from fastapi import HTTPException, Request, status
+from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 
-from app.auth.cognito import fetch_user_attributes, refresh_access_token
+from app import http_client
+from app.auth.cognito import fetch_user_attributes
+from app.auth.context import get_auth_context
+from app.auth.jwks import JWKSKeyStore
+from app.auth.refresh import refresh_for_request
+from app.cache import TTLCache
 from app.config import (
+    AUTH_ID_TOKEN_REQUIRED_ATTRIBUTES,
+    AUTH_JWKS_MIN_REFETCH_SECONDS,
+    AUTH_JWKS_TTL_SECONDS,
+    AUTH_TOKEN_CACHE_SIZE,
+    AUTH_USE_ID_TOKEN_CLAIMS,
     COGNITO_APP_CLIENT_ID,
     COGNITO_REGION,
     COGNITO_USER_POOL_ID,
@@ -22,6 +31,8 @@ from app.config import (
     LOCAL_AUTH_SUB,
     LOCAL_AUTH_USERNAME,
 )
+from app.executor import BlockingPoolSaturatedError, run_blocking
+from app.metrics import register_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +46,10 @@ jwks_url = (
 logger.debug("JWKS URL → %s", jwks_url)
 
 
-@lru_cache
 def get_jwks() -> Dict[str, Any]:
-    """Fetch and cache the Cognito JWKS document."""
+    """Fetch the Cognito JWKS document."""
     try:
-        resp = requests.get(jwks_url, timeout=10)
+        resp = http_client.get(jwks_url)
         resp.raise_for_status()
         return resp.json()
     except (RequestException, ValueError) as exc:
@@ -50,7 +60,38 @@ def get_jwks() -> Dict[str, Any]:
         )
 
 
-security = HTTPBearer(auto_error=False)
+# get_jwks is looked up on every fetch so it can be swapped out in tests.
+jwks_store = JWKSKeyStore(
+    lambda: get_jwks(),
+    ttl_seconds=AUTH_JWKS_TTL_SECONDS,
+    min_refetch_seconds=AUTH_JWKS_MIN_REFETCH_SECONDS,
+)
+register_metrics("auth_jwks", jwks_store.stats)
+
+# Claims of tokens whose signature has already been verified, keyed by token
+# hash and kept until the token's own exp.
+verified_tokens: TTLCache[Dict[str, Any]] = TTLCache(AUTH_TOKEN_CACHE_SIZE, clock=time.time)
+register_metrics("auth_token_cache", verified_tokens.stats)
+
+
+def _token_digest(credentials: str) -> str:
+    return hashlib.sha256(credentials.encode()).hexdigest()
+
+
+def _remember_verified_token(digest: str, claims: Dict[str, Any]) -> None:
+    exp = claims.get("exp")
+    # Tokens without a numeric exp are verified again on every request.
+    if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+        verified_tokens.set(digest, dict(claims), expires_at=exp)
+
+
+def _pool_saturated(exc: BlockingPoolSaturatedError) -> HTTPException:
+    """Map a full blocking I/O pool to a retryable 503 rather than a 401."""
+    logger.warning("Authentication deferred: %s", exc)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy. Please try again shortly.",
+    )
 
 
 def get_local_user() -> Dict[str, Any]:
@@ -66,24 +107,71 @@ def get_local_user() -> Dict[str, Any]:
     }
 
 
-def get_current_user(
-    request: Request,
-    token: HTTPAuthorizationCredentials | None = Depends(security),
-) -> Dict[str, Any]:
+async def get_current_user(request: Request) -> Dict[str, Any]:
     """Validate the Cognito JWT from the Authorization header or cookie.
 
     Returns the decoded JWT payload with user attributes, or raises HTTPException.
+    The outcome is kept on the request's auth context, so the token is verified
+    at most once per request however many callers ask for the user.
+    """
+    if LOCAL_AUTH_ENABLED:
+        return get_local_user()
+
+    context = get_auth_context(request)
+    credentials = _request_credentials(request)
+    return await context.resolve_user(lambda: _authenticate(request, credentials))
+
+
+async def get_verified_claims(request: Request) -> Dict[str, Any]:
+    """Return the verified JWT claims without looking up user attributes.
+
+    Pages that call several upstreams depend on this instead of
+    :func:`get_current_user`. They then fetch the user (its attribute lookup)
+    alongside their other calls, e.g. with :func:`app.fanout.fan_out`.
     """
     if LOCAL_AUTH_ENABLED:
         return get_local_user()
 
-    if token is None:
+    credentials = _request_credentials(request)
+    _, claims = await get_auth_context(request).resolve_claims(
+        lambda: _verify_token(request, credentials)
+    )
+    return dict(claims)
+
+
+def _request_credentials(request: Request) -> str:
+    context = get_auth_context(request)
+    if context.credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
 
-    credentials = token.credentials
+    refreshed = getattr(request.state, "new_access_token", None)
+    if refreshed and context.from_cookie:
+        # The middleware already refreshed the stale cookie for this request.
+        return refreshed
+    return context.credentials
+
+
+async def _authenticate(request: Request, credentials: str) -> Dict[str, Any]:
+    verified_credentials, claims = await get_auth_context(request).resolve_claims(
+        lambda: _verify_token(request, credentials)
+    )
+    return await _with_user_attributes(request, verified_credentials, dict(claims))
+
+
+async def _verify_token(request: Request, credentials: str) -> Tuple[str, Dict[str, Any]]:
+    """Verify ``credentials``, refreshing once if expired.
+
+    Returns the token that was finally verified and its claims.
+    """
+    refreshed = getattr(request.state, "new_access_token", None)
+    digest = _token_digest(credentials)
+    cached_claims = verified_tokens.get(digest)
+    if cached_claims is not None:
+        return credentials, dict(cached_claims)
+
     header: Dict[str, Any] = {}
 
     # 1) Parse and locate the correct signing key
@@ -104,37 +192,35 @@ def get_current_user(
             detail="Invalid token header",
         )
 
+    # A JWKS fetch blocks, so only an unknown kid leaves the event loop.
     try:
-        key = next(k for k in get_jwks().get("keys", []) if k.get("kid") == kid)
-    except StopIteration:
+        signing_key = jwks_store.lookup(kid) or await run_blocking(jwks_store.get, kid)
+    except BlockingPoolSaturatedError as exc:
+        raise _pool_saturated(exc) from exc
+    if signing_key is None:
         logger.error("JWT kid %s not found in JWKS", kid)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Signing key not found",
         )
+    public_key, algorithm = signing_key
 
     # 2) Validate and decode the token
     try:
-        public_key = jwk.construct(key)
         payload = jwt.decode(
             credentials,
             public_key,
-            algorithms=[key.get("alg", "")],
+            algorithms=[algorithm],
             audience=CLIENT_ID,
         )
     except ExpiredSignatureError as exc:
         logger.error("Token expired: %s", exc)
-        refresh_token = request.cookies.get("refresh_token")
-        if refresh_token:
+        refresh_token = get_auth_context(request).refresh_token
+        if refresh_token and credentials != refreshed:
             try:
-                tokens = refresh_access_token(refresh_token)
-                new_access = tokens.get("access_token")
+                new_access = await refresh_for_request(request, refresh_token)
                 if new_access:
-                    request.state.new_access_token = new_access
-                    new_creds = HTTPAuthorizationCredentials(
-                        scheme="Bearer", credentials=new_access
-                    )
-                    return get_current_user(request, token=new_creds)
+                    return await _verify_token(request, new_access)
             except Exception:
                 logger.exception("Failed automatic refresh")
         raise HTTPException(
@@ -154,6 +240,19 @@ def get_current_user(
             detail="Invalid or expired token",
         )
 
+    _remember_verified_token(digest, payload)
+    return credentials, payload
+
+
+async def _with_user_attributes(
+    request: Request, credentials: str, payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Add the Cognito user attributes to verified token claims.
+
+    With ``AUTH_USE_ID_TOKEN_CLAIMS`` the attributes come from the verified ID
+    token, and ``admin_get_user`` is only called when one of
+    ``AUTH_ID_TOKEN_REQUIRED_ATTRIBUTES`` is missing from it.
+    """
     # 3) Fetch Cognito user attributes if possible
     username = payload.get("username")
     # Ensure username is present
@@ -164,8 +263,17 @@ def get_current_user(
             detail="Invalid token payload",
         )
 
+    token_attrs: Dict[str, str] = {}
+    if AUTH_USE_ID_TOKEN_CLAIMS:
+        token_attrs = await _id_token_attributes(request, credentials, payload)
+        if all(name in token_attrs for name in AUTH_ID_TOKEN_REQUIRED_ATTRIBUTES):
+            payload["attributes"] = token_attrs
+            return payload
+
     try:
-        attrs = fetch_user_attributes(username)
+        attrs = await run_blocking(fetch_user_attributes, username)
+    except BlockingPoolSaturatedError as exc:
+        raise _pool_saturated(exc) from exc
     except Exception as exc:
         logger.exception("Failed to fetch user attributes for %s: %s", username, exc)
         raise HTTPException(
@@ -173,5 +281,94 @@ def get_current_user(
             detail="Unable to fetch user data",
         )
 
-    payload["attributes"] = attrs
+    # Cognito fills the gaps; claims from the token take precedence.
+    payload["attributes"] = {**attrs, **token_attrs}
     return payload
+
+
+# ID-token claims that describe the token rather than the user.
+_NON_ATTRIBUTE_CLAIMS = frozenset(
+    {
+        "at_hash",
+        "aud",
+        "auth_time",
+        "cognito:groups",
+        "cognito:preferred_role",
+        "cognito:roles",
+        "cognito:username",
+        "event_id",
+        "exp",
+        "iat",
+        "identities",
+        "iss",
+        "jti",
+        "nonce",
+        "origin_jti",
+        "token_use",
+    }
+)
+
+
+async def _id_token_attributes(
+    request: Request, credentials: str, access_claims: Dict[str, Any]
+) -> Dict[str, str]:
+    """Return user attributes from this request's ID token, or ``{}``.
+
+    The ID token must be signed by the pool, issued to this client, bound to
+    ``credentials`` by its ``at_hash`` and belong to the same ``sub``. Any
+    failure just means the attributes are looked up in Cognito instead.
+    """
+    id_token = getattr(request.state, "new_id_token", None) or get_auth_context(request).id_token
+    if not id_token:
+        return {}
+
+    # The at_hash check binds the ID token to this access token, so a cached
+    # verification only counts for the same pair.
+    digest = _token_digest(f"{id_token}.{credentials}")
+    claims = verified_tokens.get(digest)
+    if claims is None:
+        claims = await _verify_id_token(id_token, credentials)
+        if claims is None:
+            return {}
+        _remember_verified_token(digest, claims)
+
+    if claims.get("sub") != access_claims.get("sub"):
+        logger.warning("ID token subject does not match the access token")
+        return {}
+    return {
+        name: _attribute_value(value)
+        for name, value in claims.items()
+        if name not in _NON_ATTRIBUTE_CLAIMS
+    }
+
+
+async def _verify_id_token(id_token: str, access_token: str) -> Dict[str, Any] | None:
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        if not isinstance(kid, str):
+            return None
+        signing_key = jwks_store.lookup(kid) or await run_blocking(jwks_store.get, kid)
+        if signing_key is None:
+            return None
+        public_key, algorithm = signing_key
+        claims = jwt.decode(
+            id_token,
+            public_key,
+            algorithms=[algorithm],
+            audience=CLIENT_ID,
+            access_token=access_token,
+        )
+    except Exception as exc:
+        logger.info("Ignoring unusable ID token: %s", exc)
+        return None
+    if claims.get("token_use") != "id":
+        logger.warning("ID token cookie holds a %r token", claims.get("token_use"))
+        return None
+    return claims
+
+
+def _attribute_value(value: Any) -> str:
+    # admin_get_user returns every attribute as a string ("true", not True).
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
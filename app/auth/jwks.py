@@ -0,0 +1,156 @@
+"""Signing-key store built from the Cognito JWKS document."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from jose import jwk
+from jose.exceptions import JWKError
+
+logger = logging.getLogger(__name__)
+
+# A constructed public key and the algorithm it signs with.
+SigningKey = Tuple[Any, str]
+
+
+class JWKSKeyStore:
+    """``kid -> key`` index with TTL refresh and rotation-aware refetching.
+
+    Key objects are constructed once per JWKS fetch. After ``ttl_seconds`` the
+    current keys keep being served while one background thread refetches the
+    document. An unknown ``kid`` (e.g. right after Cognito rotates keys)
+    triggers a synchronous refetch, but concurrent callers share a single
+    fetch and refetches happen at most once per ``min_refetch_seconds``, so a
+    burst of tokens with a bogus ``kid`` cannot flood the JWKS endpoint.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Dict[str, Any]],
+        ttl_seconds: float,
+        min_refetch_seconds: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self.clock = clock
+        self._keys: Dict[str, SigningKey] = {}
+        self._fetched_at: float | None = None
+        self._fetch_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self.fetches = 0
+        self.fetch_failures = 0
+        self.unknown_kid_refetches = 0
+        self.refetches_throttled = 0
+
+    def get(self, kid: str) -> SigningKey | None:
+        """Return the signing key for ``kid``, refetching the JWKS if needed."""
+        if self._fetched_at is None:
+            self._refetch(self._fetched_at)
+
+        key = self._keys.get(kid)
+        if key is not None:
+            self._refresh_in_background_if_stale()
+            return key
+
+        observed = self._fetched_at
+        if observed is not None and self.clock() - observed < self.min_refetch_seconds:
+            with self._state_lock:
+                self.refetches_throttled += 1
+            return None
+        with self._state_lock:
+            self.unknown_kid_refetches += 1
+        self._refetch(observed)
+        return self._keys.get(kid)
+
+    def lookup(self, kid: str) -> SigningKey | None:
+        """Return an already indexed key without ever fetching synchronously.
+
+        Stale keys are still returned while a background refresh runs; callers
+        fall back to :meth:`get` (off the event loop) on ``None``.
+        """
+        key = self._keys.get(kid)
+        if key is not None:
+            self._refresh_in_background_if_stale()
+        return key
+
+    def invalidate(self) -> None:
+        """Forget all keys so the next lookup refetches the JWKS."""
+        with self._fetch_lock:
+            self._keys = {}
+            self._fetched_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._state_lock:
+            return {
+                "keys": len(self._keys),
+                "fetches": self.fetches,
+                "fetch_failures": self.fetch_failures,
+                "unknown_kid_refetches": self.unknown_kid_refetches,
+                "refetches_throttled": self.refetches_throttled,
+            }
+
+    def _refetch(self, observed: float | None) -> None:
+        """Fetch and index the JWKS unless another caller already did.
+
+        ``observed`` is the fetch time the caller saw; if it has changed by the
+        time the lock is acquired, the caller reuses that result.
+        """
+        with self._fetch_lock:
+            if self._fetched_at != observed:
+                return
+            with self._state_lock:
+                self.fetches += 1
+            try:
+                document = self.fetch()
+            except Exception:
+                with self._state_lock:
+                    self.fetch_failures += 1
+                # Keep serving known keys; only the very first load must succeed.
+                if self._fetched_at is None:
+                    raise
+                logger.exception("Failed to refresh JWKS; keeping %d cached keys", len(self._keys))
+                self._fetched_at = self.clock()
+                return
+            self._keys = _index_keys(document)
+            self._fetched_at = self.clock()
+            logger.debug("Loaded %d JWKS signing keys", len(self._keys))
+
+    def _refresh_in_background_if_stale(self) -> None:
+        observed = self._fetched_at
+        if observed is None or self.clock() - observed < self.ttl_seconds:
+            return
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh() -> None:
+            try:
+                self._refetch(observed)
+            except Exception:
+                logger.exception("Background JWKS refresh failed")
+            finally:
+                with self._state_lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, name="jwks-refresh", daemon=True).start()
+
+
+def _index_keys(document: Dict[str, Any]) -> Dict[str, SigningKey]:
+    keys: Dict[str, SigningKey] = {}
+    for key in document.get("keys", []):
+        kid = key.get("kid")
+        if not isinstance(kid, str):
+            continue
+        try:
+            keys[kid] = (jwk.construct(key), key.get("alg", ""))
+        except (JWKError, ValueError, TypeError) as exc:
+            logger.error("Skipping unusable JWKS key %s: %s", kid, exc)
+    return keys
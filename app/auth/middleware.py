@@ -4,48 +4,102 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Callable, Awaitable
+from collections.abc import Sequence
 
 from fastapi import Request, Response
-from jose import JWTError, jwt
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .cookies import ACCESS_TOKEN_COOKIE, REFRESH_TOKEN_COOKIE, set_access_token_cookie
-from .cognito import refresh_access_token
+from app.config import AUTH_MIDDLEWARE_SKIP_PREFIXES, AUTH_USE_ID_TOKEN_CLAIMS
+
+from .context import get_auth_context
+from .cookies import (
+    ACCESS_TOKEN_COOKIE,
+    REFRESH_TOKEN_COOKIE,
+    set_access_token_cookie,
+    set_id_token_cookie,
+)
+from .refresh import refresh_for_request
 
 logger = logging.getLogger(__name__)
 
+_AUTH_COOKIE_MARKERS = (
+    f"{ACCESS_TOKEN_COOKIE}=".encode(),
+    f"{REFRESH_TOKEN_COOKIE}=".encode(),
+)
+
+
+class RefreshTokenMiddleware:
+    """Refresh the access token on each request if needed.
 
-class RefreshTokenMiddleware(BaseHTTPMiddleware):
-    """Refresh the access token on each request if needed."""
+    A plain ASGI middleware: requests under ``skip_prefixes`` or without an
+    auth cookie pass straight through, and for the rest only the response
+    start message is touched to add the refreshed token cookies.
+    """
 
-    def __init__(self, app, max_age: int = 30 * 24 * 60 * 60) -> None:
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_age: int = 30 * 24 * 60 * 60,
+        skip_prefixes: Sequence[str] = AUTH_MIDDLEWARE_SKIP_PREFIXES,
+    ) -> None:
+        self.app = app
         self.max_age = max_age
+        self.skip_prefixes = tuple(skip_prefixes)
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        token = request.cookies.get(ACCESS_TOKEN_COOKIE)
-        refresh_token = request.cookies.get(REFRESH_TOKEN_COOKIE)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(self.skip_prefixes)
+            or not _has_auth_cookie(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        context = get_auth_context(request)
         new_access: str | None = None
 
-        if token:
+        if context.from_cookie and context.credentials:
             try:
-                claims = jwt.get_unverified_claims(token)
-                exp = int(claims.get("exp", 0))
-                if exp <= int(time.time()) and refresh_token:
-                    tokens = refresh_access_token(refresh_token)
-                    new_access = tokens.get("access_token")
-                    if new_access:
-                        token = new_access
-            except JWTError:
-                logger.error("Failed to parse JWT for refresh check")
+                claims = context.unverified_claims()
+                if not claims:
+                    logger.error("Failed to parse JWT for refresh check")
+                elif int(claims.get("exp", 0)) <= int(time.time()) and context.refresh_token:
+                    # Stored on request.state, so get_current_user reuses it.
+                    new_access = await refresh_for_request(request, context.refresh_token)
             except Exception:
                 logger.exception("Error refreshing token")
 
-        response = await call_next(request)
-        new_access = getattr(request.state, "new_access_token", new_access)
-        if new_access:
-            set_access_token_cookie(response, request, new_access)
-        return response
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                refreshed = getattr(request.state, "new_access_token", new_access)
+                if refreshed:
+                    new_id = getattr(request.state, "new_id_token", None)
+                    _append_token_cookies(
+                        message, request, refreshed, new_id if AUTH_USE_ID_TOKEN_CLAIMS else None
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _has_auth_cookie(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"cookie" and any(marker in value for marker in _AUTH_COOKIE_MARKERS):
+            return True
+    return False
+
+
+def _append_token_cookies(
+    message: Message, request: Request, access_token: str, id_token: str | None
+) -> None:
+    # Build the headers with the shared cookie helpers so attributes stay identical.
+    cookie_carrier = Response()
+    set_access_token_cookie(cookie_carrier, request, access_token)
+    if id_token:
+        set_id_token_cookie(cookie_carrier, request, id_token)
+    headers = MutableHeaders(scope=message)
+    for name, value in cookie_carrier.raw_headers:
+        if name == b"set-cookie":
+            headers.append("set-cookie", value.decode("latin-1"))
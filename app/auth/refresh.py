@@ -0,0 +1,98 @@
+"""Single-flight Cognito token refresh shared by the middleware and dependencies."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import Request
+
+from app.auth import cognito
+from app.cache import TTLCache
+from app.config import AUTH_REFRESH_REUSE_SECONDS
+from app.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRefreshCoordinator:
+    """Run at most one refresh per refresh token at a time.
+
+    Concurrent callers with the same refresh token await the first call and
+    share its tokens (or its exception). Successful results are reused for
+    ``reuse_seconds`` so parallel requests from one browser, all still sending
+    the old access cookie, do not each hit the token endpoint.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[str], Awaitable[Dict[str, Any]]],
+        reuse_seconds: float,
+        max_entries: int = 1024,
+    ) -> None:
+        self.refresh_func = refresh
+        self._recent: TTLCache[Dict[str, Any]] = TTLCache(max_entries, reuse_seconds)
+        self._in_flight: Dict[str, asyncio.Future[Dict[str, Any]]] = {}
+        self.refreshes = 0
+        self.shared = 0
+
+    async def refresh(self, refresh_token: str) -> Dict[str, Any]:
+        key = hashlib.sha256(refresh_token.encode()).hexdigest()
+        recent = self._recent.get(key)
+        if recent is not None:
+            self.shared += 1
+            return recent
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._refresh(key, refresh_token))
+            self._in_flight[key] = flight
+            self.refreshes += 1
+        else:
+            self.shared += 1
+        # A cancelled waiter must not cancel the refresh other requests share.
+        return await asyncio.shield(flight)
+
+    async def _refresh(self, key: str, refresh_token: str) -> Dict[str, Any]:
+        try:
+            tokens = await self.refresh_func(refresh_token)
+            self._recent.set(key, tokens)
+            return tokens
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "refreshes": self.refreshes,
+            "shared": self.shared,
+            "in_flight": len(self._in_flight),
+        }
+
+
+# cognito.refresh_access_token_async is looked up per call so tests can replace it.
+refresh_coordinator = TokenRefreshCoordinator(
+    lambda refresh_token: cognito.refresh_access_token_async(refresh_token),
+    reuse_seconds=AUTH_REFRESH_REUSE_SECONDS,
+)
+register_metrics("auth_token_refresh", refresh_coordinator.stats)
+
+
+async def refresh_for_request(request: Request, refresh_token: str) -> str | None:
+    """Return a fresh access token for this request, refreshing at most once.
+
+    The new token is stored on ``request.state.new_access_token`` (and the new
+    ID token, if Cognito sent one, on ``new_id_token``); later callers in the
+    same request reuse them, and the middleware writes them to the cookies.
+    """
+    new_access = getattr(request.state, "new_access_token", None)
+    if new_access:
+        return new_access
+    tokens = await refresh_coordinator.refresh(refresh_token)
+    new_access = tokens.get("access_token")
+    if new_access:
+        request.state.new_access_token = new_access
+        if tokens.get("id_token"):
+            request.state.new_id_token = tokens["id_token"]
+    return new_access
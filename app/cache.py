@@ -0,0 +1,101 @@
+"""Small thread-safe TTL + LRU cache for per-worker lookups."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded mapping whose entries expire at a per-entry deadline.
+
+    At most ``max_entries`` values are kept; inserting beyond that evicts the
+    least recently used entry. Expired entries are dropped when they are read.
+    ``clock`` supplies the time deadlines are compared against, so callers can
+    expire entries on wall-clock timestamps such as a JWT ``exp``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, tuple[V, float]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the live value for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(
+        self,
+        key: Hashable,
+        value: V,
+        *,
+        ttl_seconds: float | None = None,
+        expires_at: float | None = None,
+    ) -> None:
+        """Store ``value`` until ``expires_at`` or for ``ttl_seconds`` (default TTL)."""
+        if expires_at is None:
+            ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            if ttl is None:
+                raise ValueError("An expiry is required when the cache has no default TTL")
+            expires_at = self.clock() + ttl
+        if self.max_entries <= 0 or expires_at <= self.clock():
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """Drop ``key`` if it is cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss/eviction counters for the metrics endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
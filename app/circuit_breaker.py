@@ -0,0 +1,206 @@
+"""Per-upstream circuit breakers that fail fast while a dependency is down."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable
+
+from app.config import (
+    CIRCUIT_FAILURE_RATE,
+    CIRCUIT_HALF_OPEN_PROBES,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_WINDOW,
+)
+from app.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Circuit for {name} is open")
+        self.name = name
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Whether ``exc`` says the upstream is unhealthy (not just a bad request).
+
+    Transport errors, timeouts, 5xx and 429 responses count; other 4xx
+    responses come from a healthy upstream and do not.
+    """
+    response = getattr(exc, "response", None)
+    status_code = getattr(response, "status_code", None)
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+class CircuitBreaker:
+    """Failure-rate breaker over the last ``window`` calls to one upstream.
+
+    Once at least ``min_calls`` outcomes are recorded and the failure share
+    reaches ``failure_rate``, the breaker opens and calls fail immediately
+    with :class:`CircuitOpenError`. After ``open_seconds`` it is half-open:
+    up to ``half_open_probes`` calls go through, the first success closes it
+    and a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate: float,
+        window: int,
+        min_calls: int,
+        open_seconds: float,
+        half_open_probes: int = 1,
+        is_failure: Callable[[BaseException], bool] = is_upstream_failure,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.is_failure = is_failure
+        self.clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def fail_fast(self) -> None:
+        """Raise :class:`CircuitOpenError` while open, without taking a half-open probe.
+
+        Lets async callers skip queueing work for the blocking pool that
+        :meth:`guard` would reject anyway.
+        """
+        with self._lock:
+            if self._current_state() == OPEN:
+                self.rejected += 1
+                raise CircuitOpenError(self.name)
+
+    def allow(self) -> None:
+        """Admit one call or raise :class:`CircuitOpenError`."""
+        with self._lock:
+            state = self._current_state()
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return
+            if state != CLOSED:
+                self.rejected += 1
+                raise CircuitOpenError(self.name)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                logger.info("Circuit for %s closed after a successful probe", self.name)
+                self._state = CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._outcomes.append(True)
+            if state == HALF_OPEN:
+                self._open()
+            elif state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Admit the wrapped call and record its outcome.
+
+        Works around ``await`` expressions too, since nothing in it blocks.
+        """
+        self.allow()
+        try:
+            yield
+        except Exception as exc:
+            if self.is_failure(exc):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            # Cancelled: no verdict on the upstream, but free the probe slot.
+            self._release_probe()
+            raise
+        self.record_success()
+
+    def _release_probe(self) -> None:
+        with self._lock:
+            if self._current_state() == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "recent_calls": len(self._outcomes),
+                "recent_failures": sum(self._outcomes),
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _open(self) -> None:
+        if self._state != OPEN:
+            logger.warning(
+                "Circuit for %s opened; failing fast for %.0fs", self.name, self.open_seconds
+            )
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self.opened += 1
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker for upstream ``name``, using the configured thresholds."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_rate=CIRCUIT_FAILURE_RATE,
+                window=CIRCUIT_WINDOW,
+                min_calls=CIRCUIT_MIN_CALLS,
+                open_seconds=CIRCUIT_OPEN_SECONDS,
+                half_open_probes=CIRCUIT_HALF_OPEN_PROBES,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+register_metrics(
+    "circuit_breakers",
+    lambda: {name: breaker.stats() for name, breaker in list(_breakers.items())},
+)
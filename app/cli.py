@@ -0,0 +1,107 @@
+"""Command line entry points for operating the app's storage."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+from app.logger import configure_logging
+from app.services.match_import import (
+    MatchImportError,
+    import_matches,
+    read_csv_rows,
+    read_jsonl_rows,
+)
+from app.services.matches import (
+    CachedMatchRepository,
+    DynamoDBMatchRepository,
+    MatchStorageError,
+    get_match_repository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_match_shards(args: argparse.Namespace) -> int:
+    """Move matches from the unsharded partition onto the configured shards."""
+    repository = get_match_repository()
+    if isinstance(repository, CachedMatchRepository):
+        repository = repository.repository
+    if not isinstance(repository, DynamoDBMatchRepository):
+        logger.error("Shard migration needs the DynamoDB repository (set MATCHES_TABLE_NAME)")
+        return 1
+
+    try:
+        moved = repository.migrate_to_shards()
+    except (MatchStorageError, ValueError) as exc:
+        logger.error("Shard migration failed: %s", exc)
+        return 1
+
+    logger.info("Moved %d matches onto %d shards", moved, repository.shard_count)
+    return 0
+
+
+def import_matches_file(args: argparse.Namespace) -> int:
+    """Stream a CSV or JSON Lines file of matches into storage."""
+    path: Path = args.path
+    file_format = args.format or ("jsonl" if path.suffix in {".jsonl", ".ndjson"} else "csv")
+    reader = read_jsonl_rows if file_format == "jsonl" else read_csv_rows
+
+    try:
+        with path.open(newline="", encoding="utf-8") as handle:
+            result = import_matches(reader(handle), creator_sub=args.creator_sub)
+    except MatchImportError as exc:
+        for error in exc.result.errors:
+            logger.warning("Row %d: %s", error.row, error.message)
+        logger.error(
+            "Import failed: %s. %d matches were written; rows from %d on may not have been.",
+            exc,
+            exc.result.created,
+            exc.row,
+        )
+        return 1
+    except MatchStorageError as exc:
+        logger.error("Import failed: %s", exc)
+        return 1
+
+    for error in result.errors:
+        logger.warning("Row %d: %s", error.row, error.message)
+    logger.info("Imported %d matches, %d rows rejected", result.created, len(result.errors))
+    return 1 if result.errors else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="football")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser(
+        "migrate-match-shards",
+        help="Move matches from PK=MATCH onto MATCH#0..N-1 (MATCHES_SHARD_COUNT).",
+    )
+    migrate.set_defaults(handler=migrate_match_shards)
+
+    importer = commands.add_parser(
+        "import-matches",
+        help="Create matches in bulk from a CSV or JSON Lines file.",
+    )
+    importer.add_argument("path", type=Path)
+    importer.add_argument(
+        "--creator-sub", required=True, help="Cognito sub recorded as the creator."
+    )
+    importer.add_argument(
+        "--format", choices=("csv", "jsonl"), help="Defaults to the file extension."
+    )
+    importer.set_defaults(handler=import_matches_file)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    configure_logging()
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
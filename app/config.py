@@ -38,9 +38,105 @@ COGNITO_AUTH_URL_BASE = os.getenv("COGNITO_AUTH_URL_BASE")
 COGNITO_SCOPE = os.getenv("COGNITO_SCOPE")
 COGNITO_REDIRECT_URI = os.getenv("COGNITO_REDIRECT_URI")
 
+# Verified access tokens kept per worker (until their exp) to skip repeat
+# signature checks; 0 disables the cache.
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
+
+# Cognito signing keys are refreshed in the background after the TTL; an
+# unknown kid refetches them at most once per AUTH_JWKS_MIN_REFETCH_SECONDS.
+AUTH_JWKS_TTL_SECONDS = float(os.getenv("AUTH_JWKS_TTL_SECONDS", "3600"))
+AUTH_JWKS_MIN_REFETCH_SECONDS = float(os.getenv("AUTH_JWKS_MIN_REFETCH_SECONDS", "30"))
+
+# Cognito admin_get_user attributes cached per username; failed lookups are
+# cached (as no attributes) for a shorter window. A size of 0 disables it.
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "300"))
+AUTH_USER_CACHE_FAILURE_TTL_SECONDS = float(
+    os.getenv("AUTH_USER_CACHE_FAILURE_TTL_SECONDS", "30")
+)
+# How long a page that fans out its upstream calls waits for the user lookup.
+AUTH_USER_ATTRIBUTES_TIMEOUT_SECONDS = float(
+    os.getenv("AUTH_USER_ATTRIBUTES_TIMEOUT_SECONDS", "5")
+)
+
+# Opt-in: build the user's attributes from the verified ID token (kept in its
+# own cookie) and only call admin_get_user when a required attribute is missing.
+AUTH_USE_ID_TOKEN_CLAIMS = _is_enabled(os.getenv("AUTH_USE_ID_TOKEN_CLAIMS"))
+AUTH_ID_TOKEN_REQUIRED_ATTRIBUTES = tuple(
+    name.strip()
+    for name in os.getenv("AUTH_ID_TOKEN_REQUIRED_ATTRIBUTES", "email,nickname").split(",")
+    if name.strip()
+)
+
+# A refreshed token is shared with requests using the same refresh token for
+# this long, so parallel requests from one browser refresh only once.
+AUTH_REFRESH_REUSE_SECONDS = float(os.getenv("AUTH_REFRESH_REUSE_SECONDS", "30"))
+
+# Path prefixes the token-refresh middleware never inspects (comma-separated).
+AUTH_MIDDLEWARE_SKIP_PREFIXES = tuple(
+    prefix.strip()
+    for prefix in os.getenv("AUTH_MIDDLEWARE_SKIP_PREFIXES", "/static/,/health").split(",")
+    if prefix.strip()
+)
+
+# Threads for blocking boto3/requests calls made from async routes, and how many
+# more calls may wait for a thread before requests are rejected with a 503.
+BLOCKING_IO_POOL_SIZE = int(os.getenv("BLOCKING_IO_POOL_SIZE", "16"))
+BLOCKING_IO_QUEUE_DEPTH = int(os.getenv("BLOCKING_IO_QUEUE_DEPTH", "64"))
+
+# Keep-alive connections kept per upstream host, and default request timeouts.
+# Every blocking thread may call the same host, so the pool defaults to one
+# connection per thread; a smaller pool discards connections under load.
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", str(BLOCKING_IO_POOL_SIZE)))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "3"))
+HTTP_READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "10"))
+
+# Circuit breakers per upstream (settings API, Cognito token endpoint): open once
+# CIRCUIT_FAILURE_RATE of the last CIRCUIT_WINDOW calls failed (after at least
+# CIRCUIT_MIN_CALLS), fail fast for CIRCUIT_OPEN_SECONDS, then let
+# CIRCUIT_HALF_OPEN_PROBES trial calls through.
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1"))
+# Read timeout for the Cognito token endpoint (login callback and refresh).
+COGNITO_TOKEN_TIMEOUT_SECONDS = float(os.getenv("COGNITO_TOKEN_TIMEOUT_SECONDS", "5"))
+
+# API Gateway user settings cached per sub and updated when they are saved; a
+# 404 is remembered as "no settings" for a shorter window. 0 disables the cache.
+USER_SETTINGS_CACHE_SIZE = int(os.getenv("USER_SETTINGS_CACHE_SIZE", "1024"))
+USER_SETTINGS_CACHE_TTL_SECONDS = float(os.getenv("USER_SETTINGS_CACHE_TTL_SECONDS", "300"))
+USER_SETTINGS_CACHE_MISSING_TTL_SECONDS = float(
+    os.getenv("USER_SETTINGS_CACHE_MISSING_TTL_SECONDS", "30")
+)
+# After this the settings page renders without saved settings.
+USER_SETTINGS_TIMEOUT_SECONDS = float(os.getenv("USER_SETTINGS_TIMEOUT_SECONDS", "3"))
+
+# Compiled Jinja2 templates shared by workers on a host; empty uses a
+# per-user directory under the system temp dir.
+JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", "")
+
 # DynamoDB tables
 MATCHES_TABLE_NAME = os.getenv("MATCHES_TABLE_NAME")
 MATCHES_USE_MEMORY = STAGE == "local" and _is_enabled(os.getenv("MATCHES_USE_MEMORY"))
+# Spread match writes over MATCH#0..N-1; 1 keeps the single MATCH partition.
+MATCHES_SHARD_COUNT = int(os.getenv("MATCHES_SHARD_COUNT", "1"))
+# Keep reading the unsharded MATCH partition until migrate-match-shards has run.
+MATCHES_READ_LEGACY_PARTITION = _is_enabled(os.getenv("MATCHES_READ_LEGACY_PARTITION"))
+# Per-worker read cache for match lists; 0 disables it.
+MATCHES_CACHE_TTL_SECONDS = float(os.getenv("MATCHES_CACHE_TTL_SECONDS", "5"))
+MATCHES_CACHE_STALE_SECONDS = float(os.getenv("MATCHES_CACHE_STALE_SECONDS", "30"))
+MATCHES_CACHE_STALE_IF_ERROR_SECONDS = float(
+    os.getenv("MATCHES_CACHE_STALE_IF_ERROR_SECONDS", "300")
+)
+# Rendered match cards kept per worker, keyed by every field a card shows;
+# 0 disables the cache.
+MATCH_CARD_CACHE_SIZE = int(os.getenv("MATCH_CARD_CACHE_SIZE", "2048"))
+MATCH_CARD_CACHE_TTL_SECONDS = float(os.getenv("MATCH_CARD_CACHE_TTL_SECONDS", "3600"))
+MATCHES_PAGE_SIZE = int(os.getenv("MATCHES_PAGE_SIZE", "20"))
+# Signs opaque pagination cursors; set the same value on every worker.
+MATCHES_CURSOR_SECRET = os.getenv("MATCHES_CURSOR_SECRET")
 
 _missing = [
     name
@@ -60,6 +156,10 @@ if _missing and not LOCAL_AUTH_ENABLED:
 if STAGE != "local" and not MATCHES_TABLE_NAME:
     raise RuntimeError("MATCHES_TABLE_NAME must be set outside local development")
 
+# Without a shared secret each worker signs cursors with its own random key.
+if STAGE != "local" and not MATCHES_CURSOR_SECRET:
+    raise RuntimeError("MATCHES_CURSOR_SECRET must be set outside local development")
+
 # Separatly ensure the redirect URI is properly encoded for URL usage to make pylance happy
 if not COGNITO_REDIRECT_URI and not LOCAL_AUTH_ENABLED:
     raise RuntimeError("COGNITO_REDIRECT_URI must be set in environment variables")
@@ -0,0 +1,84 @@
+"""Bounded thread pool for running blocking I/O from async routes."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, TypeVar
+
+from app.config import BLOCKING_IO_POOL_SIZE, BLOCKING_IO_QUEUE_DEPTH
+from app.metrics import register_metrics
+
+T = TypeVar("T")
+
+
+class BlockingPoolSaturatedError(RuntimeError):
+    """Raised when the blocking I/O pool already has a full queue."""
+
+
+class BlockingIOPool:
+    """Thread pool that rejects work instead of queueing without bound.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a thread. Further calls fail fast with
+    :class:`BlockingPoolSaturatedError` so a slow upstream cannot pile up an
+    unbounded backlog of requests.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="blocking-io"
+        )
+        self._lock = Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` on the pool and await its result."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise BlockingPoolSaturatedError("Blocking I/O pool is saturated")
+            self._pending += 1
+
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._release(None)
+            raise
+        # The slot is freed when the thread finishes, not when the caller
+        # stops waiting: a cancelled await leaves the call running.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future: Future[Any] | None) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+blocking_io_pool = BlockingIOPool(BLOCKING_IO_POOL_SIZE, BLOCKING_IO_QUEUE_DEPTH)
+register_metrics("blocking_io_pool", blocking_io_pool.stats)
+
+
+async def run_blocking(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the shared bounded pool."""
+    return await blocking_io_pool.run(func, *args, **kwargs)
@@ -0,0 +1,118 @@
+"""Concurrent calls to independent upstreams with per-call timeouts."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException, status
+
+from app.circuit_breaker import CircuitOpenError
+from app.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+_REQUIRED: Any = object()
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """One call in a :func:`fan_out`.
+
+    ``call`` is awaited for at most ``timeout`` seconds. Without a
+    ``fallback`` the call is required: its error is re-raised (a timeout
+    becomes a 503, as does an open circuit breaker) and the other calls are
+    cancelled. With a ``fallback`` a timeout or error is logged and the
+    fallback is used in its place.
+    """
+
+    name: str
+    call: Callable[[], Awaitable[Any]]
+    timeout: float
+    fallback: Any = _REQUIRED
+
+    @property
+    def required(self) -> bool:
+        return self.fallback is _REQUIRED
+
+
+@dataclass
+class FanOutResult:
+    """Values by upstream name, plus ``failed`` names mapped to the failure kind.
+
+    Kinds are "timeout", "circuit_open" and "error".
+    """
+
+    values: dict[str, Any] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+
+_stats: dict[str, dict[str, int]] = {}
+register_metrics("fan_out", lambda: {name: dict(counts) for name, counts in _stats.items()})
+
+
+async def fan_out(*upstreams: Upstream) -> FanOutResult:
+    """Run ``upstreams`` concurrently; latency tracks the slowest, not the sum."""
+    tasks = [asyncio.ensure_future(_call(upstream)) for upstream in upstreams]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        # Let them finish cancelling so nothing is left pending or unretrieved.
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    result = FanOutResult()
+    error: BaseException | None = None
+    for upstream, task in zip(upstreams, tasks):
+        if not task.done() or task.cancelled():
+            continue
+        if task.exception() is not None:
+            error = error or task.exception()
+            continue
+        value, failure = task.result()
+        result.values[upstream.name] = value
+        if failure:
+            result.failed[upstream.name] = failure
+    if error is not None:
+        raise error
+    return result
+
+
+async def _call(upstream: Upstream) -> tuple[Any, str | None]:
+    counts = _stats.setdefault(
+        upstream.name, {"calls": 0, "timeouts": 0, "circuit_open": 0, "errors": 0}
+    )
+    counts["calls"] += 1
+    try:
+        return await asyncio.wait_for(upstream.call(), upstream.timeout), None
+    except asyncio.TimeoutError:
+        counts["timeouts"] += 1
+        if upstream.required:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"{upstream.name} did not respond in time",
+            ) from None
+        logger.warning("%s timed out after %.1fs; using fallback", upstream.name, upstream.timeout)
+        return upstream.fallback, "timeout"
+    except CircuitOpenError:
+        counts["circuit_open"] += 1
+        if upstream.required:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"{upstream.name} is unavailable",
+            ) from None
+        logger.info("%s circuit is open; using fallback", upstream.name)
+        return upstream.fallback, "circuit_open"
+    except Exception:
+        counts["errors"] += 1
+        if upstream.required:
+            raise
+        logger.exception("%s failed; using fallback", upstream.name)
+        return upstream.fallback, "error"
@@ -0,0 +1,120 @@
+"""Shared keep-alive HTTP sessions for calls to upstream services."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from threading import Lock
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_POOL_SIZE, HTTP_READ_TIMEOUT_SECONDS
+from app.metrics import register_metrics
+
+
+class HTTPClientPool:
+    """One pooled ``requests.Session`` per upstream origin.
+
+    Connections are kept alive between calls, so repeat requests to Cognito or
+    API Gateway skip the TCP and TLS handshakes. Each origin keeps up to
+    ``pool_size`` idle connections. Calls without an explicit ``timeout`` use
+    the configured ``(connect, read)`` timeouts.
+    """
+
+    def __init__(self, pool_size: int, connect_timeout: float, read_timeout: float) -> None:
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = Lock()
+
+    def session_for(self, url: str) -> requests.Session:
+        origin = _origin(url)
+        session = self._sessions.get(origin)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount(origin, adapter)
+                self._sessions[origin] = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Requests and newly opened connections per origin."""
+        hosts: dict[str, dict[str, int]] = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for origin, session in sessions:
+            pools = session.get_adapter(origin).poolmanager.pools
+            # urllib3 keys pools by host and TLS settings; sum whatever exists.
+            connection_pools = [pools[key] for key in pools.keys()]
+            sent = sum(pool.num_requests for pool in connection_pools)
+            opened = sum(pool.num_connections for pool in connection_pools)
+            hosts[origin] = {
+                "requests": sent,
+                "connections_opened": opened,
+                "connections_reused": max(sent - opened, 0),
+            }
+        return {"pool_size": self.pool_size, "hosts": hosts}
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+http_pool = HTTPClientPool(HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS)
+register_metrics("http_client", http_pool.stats)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """``requests.get`` over the shared pooled sessions."""
+    return http_pool.request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    """``requests.post`` over the shared pooled sessions."""
+    return http_pool.request("POST", url, **kwargs)
+
+
+# httpx connection pools belong to the event loop that opened them, so each
+# loop (normally just the server's) gets its own client.
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def async_client() -> httpx.AsyncClient:
+    """Return the pooled non-blocking client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_keepalive_connections=HTTP_POOL_SIZE),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Close the running loop's client, e.g. on application shutdown."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
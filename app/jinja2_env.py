@@ -1,8 +1,90 @@
 """Jinja2 environment configuration for HTML templates."""
 
+import logging
+import os
+import tempfile
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Any
+
 from fastapi.templating import Jinja2Templates
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import Markup
+
+from app.cache import TTLCache
+from app.config import (
+    JINJA_BYTECODE_CACHE_DIR,
+    MATCH_CARD_CACHE_SIZE,
+    MATCH_CARD_CACHE_TTL_SECONDS,
+    STAGE,
+)
+from app.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+
+def _bytecode_cache(directory: str) -> BytecodeCache | None:
+    """Compiled templates shared by every worker on the host.
+
+    Entries are keyed by template name and source checksum, so a deploy with
+    changed templates never reads stale bytecode. A configured directory that
+    cannot be created or written to disables the cache instead of failing
+    renders later.
+    """
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.TemporaryFile(dir=directory):
+                pass
+        return FileSystemBytecodeCache(directory or None)
+    except (OSError, RuntimeError) as exc:
+        logger.warning("Jinja2 bytecode cache disabled: %s", exc)
+        return None
+
+
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(BASE_DIR / "templates"),
+        autoescape=True,
+        # Checking template mtimes on every render only helps while editing locally.
+        auto_reload=STAGE == "local",
+        bytecode_cache=_bytecode_cache(JINJA_BYTECODE_CACHE_DIR),
+    )
+)
+
+
+def precompile_templates() -> int:
+    """Load every template so no request pays for compiling one; returns the count."""
+    env = templates.env
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+# Rendered match cards. Keys pair the template object with the match's
+# card_key, so neither an edited match nor a reloaded template reuses old HTML.
+match_card_cache: TTLCache[str] = TTLCache(MATCH_CARD_CACHE_SIZE, MATCH_CARD_CACHE_TTL_SECONDS)
+register_metrics("match_card_cache", match_card_cache.stats)
+
+
+def render_match_cards(matches: Iterable[Any]) -> Markup:
+    """Render one card per match, reusing cached HTML for unchanged matches.
+
+    Cards hold no per-viewer data, so they are shared by every request.
+    """
+    template = templates.env.get_template("partials/match_card.html")
+    cards = []
+    for match in matches:
+        key = (template, match.card_key)
+        card = match_card_cache.get(key)
+        if card is None:
+            card = template.render(match=match)
+            match_card_cache.set(key, card)
+        cards.append(card)
+    return Markup("\n".join(cards))
+
+
+templates.env.globals["render_match_cards"] = render_match_cards
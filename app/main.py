@@ -1,26 +1,30 @@
 """Application entry point for the FastAPI application."""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import logging
+import time
 
 from app.logger import configure_logging
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.security import HTTPAuthorizationCredentials
 from app.auth import dependencies as auth_dependencies
+from app.auth.context import get_auth_context
 from app.auth.cookies import (
-    ACCESS_TOKEN_COOKIE,
     set_access_token_cookie,
+    set_id_token_cookie,
     set_refresh_token_cookie,
 )
 from app.auth.routes import auth_router
-from app.config import COGNITO_AUTH_URL
-from app.jinja2_env import templates
-from app.auth.cognito import exchange_code_for_tokens
+from app.config import AUTH_USE_ID_TOKEN_CLAIMS, COGNITO_AUTH_URL, STAGE
+from app.jinja2_env import precompile_templates, templates
+from app import http_client
+from app.auth.cognito import exchange_code_for_tokens_async
 from app.auth.middleware import RefreshTokenMiddleware
 from app.routes.matches import matches_router
+from app.routes.metrics import metrics_router
 from app.routes.settings import settings_router
 
 configure_logging()
@@ -30,7 +34,20 @@ logger = logging.getLogger(__name__)
 # Determine this file’s parent dir (i.e. the "app/" folder)
 BASE_DIR = Path(__file__).parent
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compile templates before serving; close pooled connections on shutdown."""
+    started = time.perf_counter()
+    compiled = precompile_templates()
+    logger.info(
+        "Precompiled %d templates in %.0f ms", compiled, (time.perf_counter() - started) * 1000
+    )
+    yield
+    await http_client.aclose_async_client()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(RefreshTokenMiddleware)
 
 # Mount the static directory under /static, using the app/static folder
@@ -43,6 +60,9 @@ app.mount(
 # Include your Cognito-based auth routes at /auth
 app.include_router(auth_router)
 app.include_router(matches_router)
+# Cache, breaker and upstream internals are only exposed while developing locally.
+if STAGE == "local":
+    app.include_router(metrics_router)
 app.include_router(settings_router)
 
 
@@ -50,14 +70,13 @@ app.include_router(settings_router)
 async def root(request: Request) -> Response:
     """Render the homepage if the user has a valid token, otherwise redirect."""
 
-    auth_header = request.headers.get("Authorization")
-    cookie_token = request.cookies.get(ACCESS_TOKEN_COOKIE)
+    context = get_auth_context(request)
     code = request.query_params.get("code")
 
     logger.debug(
-        "Auth request received: has_authorization=%s has_access_cookie=%s has_code=%s",
-        bool(auth_header),
-        bool(cookie_token),
+        "Auth request received: has_credentials=%s from_cookie=%s has_code=%s",
+        context.credentials is not None,
+        context.from_cookie,
         bool(code),
     )
 
@@ -70,40 +89,37 @@ async def root(request: Request) -> Response:
 
     # If Cognito redirected back with a code, exchange and set cookie
     if code:
-        tokens = exchange_code_for_tokens(code)
+        tokens = await exchange_code_for_tokens_async(code)
         access_token = tokens.get("access_token") or tokens.get("id_token")
+        id_token = tokens.get("id_token")
         refresh_token = tokens.get("refresh_token")
         if not access_token:
             raise RuntimeError("Cognito did not return an access or ID token")
 
         redirect = RedirectResponse("/", status_code=status.HTTP_303_SEE_OTHER)
         set_access_token_cookie(redirect, request, access_token)
+        if AUTH_USE_ID_TOKEN_CLAIMS and id_token and id_token != access_token:
+            # Its claims replace the admin_get_user lookup on later requests.
+            set_id_token_cookie(redirect, request, id_token)
         if refresh_token:
             set_refresh_token_cookie(redirect, request, refresh_token)
         logger.debug("Cognito callback exchanged code and set auth cookies")
         return redirect
 
     # If we have credentials in header or cookie, validate and show home
-    if auth_header or cookie_token:
-        scheme = "Bearer"
-        token = cookie_token or ""
-        if auth_header:
-            scheme, _, token = auth_header.partition(" ")
+    if context.credentials:
+        try:
+            user = await auth_dependencies.get_current_user(request)
+        except Exception as exc:
+            # A busy auth backend is a 503, not a reason to log in again.
+            if isinstance(exc, HTTPException) and exc.status_code >= 500:
+                raise
+            return RedirectResponse(
+                COGNITO_AUTH_URL,
+                status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            )
 
-        user = None
-        if token:
-            creds = HTTPAuthorizationCredentials(scheme=scheme, credentials=token)
-            try:
-                user = auth_dependencies.get_current_user(request=request, token=creds)
-            except TypeError:
-                user = auth_dependencies.get_current_user(token=creds)
-            except Exception:
-                return RedirectResponse(
-                    COGNITO_AUTH_URL,
-                    status_code=status.HTTP_307_TEMPORARY_REDIRECT,
-                )
-
-        logger.debug("Authenticated homepage request for sub=%s", user.get("sub") if user else None)
+        logger.debug("Authenticated homepage request for sub=%s", user.get("sub"))
         # TemplateResponse now expects the request first
         return templates.TemplateResponse(request, "home.html", {"user": user})
 
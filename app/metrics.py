@@ -0,0 +1,33 @@
+"""In-process metrics registry for caches, pools and other runtime counters."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+MetricsProvider = Callable[[], dict[str, Any]]
+
+_providers: dict[str, MetricsProvider] = {}
+
+
+def register_metrics(name: str, provider: MetricsProvider) -> None:
+    """Register (or replace) a callable returning the current counters for ``name``."""
+    _providers[name] = provider
+
+
+def unregister_metrics(name: str) -> None:
+    """Remove a metrics provider. Intended for tests."""
+    _providers.pop(name, None)
+
+
+def metrics_snapshot() -> dict[str, dict[str, Any]]:
+    """Collect the current counters from every registered provider."""
+    snapshot: dict[str, dict[str, Any]] = {}
+    for name, provider in list(_providers.items()):
+        try:
+            snapshot[name] = provider()
+        except Exception:
+            logger.exception("Failed to collect metrics for %s", name)
+    return snapshot
@@ -9,14 +9,18 @@ from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from fastapi.responses import RedirectResponse, Response
 
 from app.auth.dependencies import get_current_user
+from app.config import MATCHES_PAGE_SIZE
 from app.csrf import get_or_create_csrf_token, set_csrf_cookie, validate_csrf_token
 from app.jinja2_env import templates
 from app.services.matches import (
     CLASS_OPTIONS,
+    InvalidCursorError,
+    MatchPage,
     MatchStorageError,
-    create_match,
+    create_match_async,
     format_class,
-    list_matches,
+    list_matches_page_async,
+    list_my_matches_async,
 )
 
 matches_router = APIRouter(tags=["matches"])
@@ -25,18 +29,32 @@ matches_router = APIRouter(tags=["matches"])
 @matches_router.get("/matches", include_in_schema=False)
 async def get_matches(
     request: Request,
+    cursor: str | None = None,
+    include_past: bool = False,
     user: dict[str, Any] = Depends(get_current_user),
 ) -> Response:
-    """Render the match list and creation form."""
+    """Render one page of the match list and the creation form.
+
+    Only matches from the current minute onwards are listed unless
+    ``include_past`` is set.
+    """
     csrf_token = get_or_create_csrf_token(request)
     class_options = [(value, format_class(value)) for value in CLASS_OPTIONS]
     storage_error = None
     response_status = status.HTTP_200_OK
+    since = None if include_past else datetime.now().replace(second=0, microsecond=0)
 
     try:
-        matches = list_matches()
+        page = await list_matches_page_async(
+            limit=MATCHES_PAGE_SIZE, cursor=cursor, since=since
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
     except MatchStorageError as exc:
-        matches = []
+        page = MatchPage(items=[])
         storage_error = str(exc)
         response_status = status.HTTP_503_SERVICE_UNAVAILABLE
 
@@ -45,7 +63,10 @@ async def get_matches(
         "matches.html",
         {
             "user": user,
-            "matches": matches,
+            "matches": page.items,
+            "next_cursor": page.next_cursor,
+            "previous_cursor": page.previous_cursor,
+            "include_past": include_past,
             "class_options": class_options,
             "csrf_token": csrf_token,
             "storage_error": storage_error,
@@ -56,6 +77,44 @@ async def get_matches(
     return response
 
 
+@matches_router.get("/matches/mine", include_in_schema=False)
+async def get_my_matches(
+    request: Request,
+    cursor: str | None = None,
+    user: dict[str, Any] = Depends(get_current_user),
+) -> Response:
+    """Render one page of the matches the current user created."""
+    storage_error = None
+    response_status = status.HTTP_200_OK
+
+    try:
+        page = await list_my_matches_async(
+            user["sub"], limit=MATCHES_PAGE_SIZE, cursor=cursor
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    except MatchStorageError as exc:
+        page = MatchPage(items=[])
+        storage_error = str(exc)
+        response_status = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return templates.TemplateResponse(
+        request,
+        "my_matches.html",
+        {
+            "user": user,
+            "matches": page.items,
+            "next_cursor": page.next_cursor,
+            "previous_cursor": page.previous_cursor,
+            "storage_error": storage_error,
+        },
+        status_code=response_status,
+    )
+
+
 @matches_router.post("/matches", include_in_schema=False)
 async def post_match(
     request: Request,
@@ -74,7 +133,7 @@ async def post_match(
 
     try:
         starts_at_value = datetime.fromisoformat(starts_at)
-        create_match(
+        await create_match_async(
             creator_sub=user["sub"],
             title=title,
             starts_at=starts_at_value,
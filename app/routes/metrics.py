@@ -0,0 +1,20 @@
+"""Route exposing in-process runtime metrics."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.auth.dependencies import get_current_user
+from app.metrics import metrics_snapshot
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/internal/metrics", include_in_schema=False)
+async def get_metrics(
+    user: dict[str, Any] = Depends(get_current_user),
+) -> dict[str, dict[str, Any]]:
+    """Return cache and pool counters for this worker process."""
+    return metrics_snapshot()
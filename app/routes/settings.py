@@ -9,10 +9,16 @@ from fastapi import APIRouter, Depends, Form, Request, status
 from fastapi.responses import RedirectResponse, Response
 
 from app.auth import dependencies as auth_dependencies
-from app.auth.dependencies import get_current_user
+from app.auth.cognito import invalidate_user_attributes
+from app.auth.dependencies import get_current_user, get_verified_claims
+from app.config import AUTH_USER_ATTRIBUTES_TIMEOUT_SECONDS, USER_SETTINGS_TIMEOUT_SECONDS
 from app.csrf import get_or_create_csrf_token, set_csrf_cookie, validate_csrf_token
+from app.fanout import Upstream, fan_out
 from app.jinja2_env import templates
-from app.services.user_settings import fetch_user_settings, save_user_settings
+from app.services.user_settings import (
+    fetch_user_settings_async,
+    save_user_settings_async,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,23 +28,36 @@ settings_router = APIRouter(tags=["settings"])
 @settings_router.get("/settings", include_in_schema=False)
 async def get_settings(
     request: Request,
-    user: dict[str, Any] = Depends(get_current_user),
+    claims: dict[str, Any] = Depends(get_verified_claims),
 ) -> Response:
-    """Render the user settings form populated from API Gateway."""
-    settings = (
-        {
+    """Render the user settings form populated from API Gateway.
+
+    Only the token is checked up front; the Cognito user lookup and the saved
+    settings are then fetched concurrently. If the settings call fails or
+    times out, the form is rendered empty.
+    """
+    if auth_dependencies.LOCAL_AUTH_ENABLED:
+        user = claims
+        settings = {
             "nickname": user.get("attributes", {}).get("nickname", ""),
             "preferred_class": "",
         }
-        if auth_dependencies.LOCAL_AUTH_ENABLED
-        else {}
-    )
-
-    try:
-        if not auth_dependencies.LOCAL_AUTH_ENABLED:
-            settings = fetch_user_settings(user["sub"])
-    except Exception:
-        logger.exception("Failed to fetch user settings")
+    else:
+        results = await fan_out(
+            Upstream(
+                "cognito_user",
+                lambda: auth_dependencies.get_current_user(request),
+                timeout=AUTH_USER_ATTRIBUTES_TIMEOUT_SECONDS,
+            ),
+            Upstream(
+                "user_settings",
+                lambda: fetch_user_settings_async(claims["sub"]),
+                timeout=USER_SETTINGS_TIMEOUT_SECONDS,
+                fallback={},
+            ),
+        )
+        user = results["cognito_user"]
+        settings = results["user_settings"]
 
     csrf_token = get_or_create_csrf_token(request)
     response = templates.TemplateResponse(
@@ -63,7 +82,8 @@ async def post_settings(
 
     try:
         if not auth_dependencies.LOCAL_AUTH_ENABLED:
-            save_user_settings(user["sub"], nickname, preferred_class)
+            await save_user_settings_async(user["sub"], nickname, preferred_class)
+            invalidate_user_attributes(user.get("username", ""))
     except Exception:
         logger.exception("Failed to save user settings")
 
@@ -0,0 +1,138 @@
+"""Bulk import of matches from CSV or JSON Lines files."""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, TextIO
+
+from app.services.matches import (
+    BATCH_WRITE_SIZE,
+    Match,
+    MatchStorageError,
+    _build_match,
+    get_match_repository,
+)
+
+IMPORT_COLUMNS = ("title", "starts_at", "location", "class_from", "class_to", "max_players")
+
+# Rows buffered before each create_many call: a few BatchWriteItem groups.
+IMPORT_CHUNK_SIZE = BATCH_WRITE_SIZE * 4
+
+
+@dataclass(frozen=True)
+class ImportRowError:
+    """A row that was not imported. ``row`` counts data rows from 1."""
+
+    row: int
+    message: str
+
+
+@dataclass
+class MatchImportResult:
+    """Summary of a bulk import."""
+
+    created: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+
+class MatchImportError(MatchStorageError):
+    """Storage failed partway through an import.
+
+    ``result`` covers the rows handled before the failure: ``result.created``
+    matches are known to be written. Rows from ``row`` onwards may or may not
+    have been written.
+    """
+
+    def __init__(self, message: str, result: MatchImportResult, row: int) -> None:
+        super().__init__(message)
+        self.result = result
+        self.row = row
+
+
+def import_matches(
+    rows: Iterable[Mapping[str, Any] | ValueError], *, creator_sub: str
+) -> MatchImportResult:
+    """Validate and store matches from ``rows`` in batches.
+
+    Rows are consumed lazily, so large files are never held in memory. Each
+    row goes through the same validation as the match form. Rows that failed
+    to decode upstream can be passed as ``ValueError`` instances and are
+    reported like any other invalid row. A storage failure raises
+    :class:`MatchImportError` with the progress made so far.
+    """
+    repository = get_match_repository()
+    result = MatchImportResult()
+    pending: list[tuple[int, Match]] = []
+
+    def flush() -> None:
+        try:
+            outcome = repository.create_many([match for _, match in pending])
+        except MatchStorageError as exc:
+            raise MatchImportError(str(exc), result, pending[0][0]) from exc
+        result.created += len(outcome.created)
+        for position in outcome.failed:
+            result.errors.append(
+                ImportRowError(pending[position][0], "DynamoDB did not accept the write")
+            )
+        pending.clear()
+
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            if isinstance(row, ValueError):
+                raise row
+            pending.append((row_number, _match_from_row(row, creator_sub)))
+        except ValueError as exc:
+            result.errors.append(ImportRowError(row_number, str(exc)))
+            continue
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            flush()
+
+    if pending:
+        flush()
+    return result
+
+
+def read_csv_rows(handle: TextIO) -> Iterator[Mapping[str, Any]]:
+    """Yield CSV rows as dicts keyed by the header line."""
+    yield from csv.DictReader(handle)
+
+
+def read_jsonl_rows(handle: TextIO) -> Iterator[Mapping[str, Any] | ValueError]:
+    """Yield one object per non-blank JSON Lines row, or the decode error."""
+    for line in handle:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield ValueError(f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(row, dict):
+            yield ValueError("Each JSON line must be an object")
+            continue
+        yield row
+
+
+def _match_from_row(row: Mapping[str, Any], creator_sub: str) -> Match:
+    missing = [column for column in IMPORT_COLUMNS if row.get(column) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    try:
+        max_players = int(row["max_players"])
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Max players must be a whole number") from exc
+
+    return _build_match(
+        creator_sub=creator_sub,
+        title=str(row["title"]),
+        starts_at=datetime.fromisoformat(str(row["starts_at"])),
+        location=str(row["location"]),
+        class_from=str(row["class_from"]),
+        class_to=str(row["class_to"]),
+        max_players=max_players,
+        notes=str(row.get("notes") or ""),
+    )
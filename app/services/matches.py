@@ -2,21 +2,59 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import base64
+import binascii
+import hashlib
+import heapq
+import hmac
+import json
+import logging
+import random
+import secrets
+import time
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from itertools import count
-from threading import Lock
-from typing import Any, Protocol
+from itertools import count, islice
+from operator import itemgetter
+from threading import Lock, Thread
+from typing import Any, Callable, Iterable, Iterator, Protocol, Sequence
 from uuid import uuid4
 
 import boto3
 from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import BotoCoreError, ClientError
 
-from app.config import AWS_REGION, MATCHES_TABLE_NAME, MATCHES_USE_MEMORY
+from app.config import (
+    AWS_REGION,
+    MATCHES_CACHE_STALE_IF_ERROR_SECONDS,
+    MATCHES_CACHE_STALE_SECONDS,
+    MATCHES_CACHE_TTL_SECONDS,
+    MATCHES_CURSOR_SECRET,
+    MATCHES_READ_LEGACY_PARTITION,
+    MATCHES_SHARD_COUNT,
+    MATCHES_TABLE_NAME,
+    MATCHES_USE_MEMORY,
+)
+from app.executor import BlockingPoolSaturatedError, run_blocking
+from app.metrics import register_metrics
 
+logger = logging.getLogger(__name__)
 
-@dataclass(frozen=True)
+MAX_PAGE_SIZE = 100
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_ATTEMPTS = 6
+BATCH_WRITE_BASE_BACKOFF = 0.05
+BATCH_WRITE_MAX_BACKOFF = 2.0
+
+_serializer = TypeSerializer()
+
+
+@dataclass(frozen=True, slots=True)
 class Match:
     """A locally organized football match."""
 
@@ -30,11 +68,93 @@ class Match:
     max_players: int
     notes: str
 
+    @property
+    def sort_key(self) -> str:
+        """Keyset position shared by every repository, matching the DynamoDB ``SK``."""
+        return f"START#{self.starts_at.isoformat(timespec='seconds')}#{self.id}"
+
+    @property
+    def starts_at_label(self) -> str:
+        """Display-friendly date and time."""
+        return self.starts_at.strftime("%d %b %Y %H:%M")
+
+    @property
+    def card_key(self) -> tuple[Any, ...]:
+        """Fragment-cache key: the sort key (start time and id) plus every shown field."""
+        return (
+            self.sort_key,
+            self.title,
+            self.location,
+            self.class_from,
+            self.class_to,
+            self.max_players,
+            self.notes,
+        )
+
+    @property
+    def class_range_label(self) -> str:
+        """Display-friendly class range."""
+        if self.class_from == self.class_to:
+            return format_class(self.class_from)
+        return f"{format_class(self.class_from)} to {format_class(self.class_to)}"
+
+
+class MatchSummary:
+    """Lean, read-only list view of a stored match.
+
+    Built straight from a projected DynamoDB item: only the attributes a match
+    card shows are kept, and ``starts_at`` is parsed on first use.
+    """
+
+    __slots__ = (
+        "id",
+        "sort_key",
+        "title",
+        "location",
+        "class_from",
+        "class_to",
+        "max_players",
+        "notes",
+        "_starts_at_raw",
+        "_starts_at",
+    )
+
+    def __init__(self, item: dict[str, Any]) -> None:
+        self.id: str = item["match_id"]
+        self.sort_key: str = item["SK"]
+        self.title: str = item["title"]
+        self.location: str = item["location"]
+        self.class_from: str = item["class_from"]
+        self.class_to: str = item["class_to"]
+        self.max_players = int(item["max_players"])
+        self.notes: str = item.get("notes", "")
+        self._starts_at_raw: str = item["starts_at"]
+        self._starts_at: datetime | None = None
+
+    @property
+    def starts_at(self) -> datetime:
+        if self._starts_at is None:
+            self._starts_at = datetime.fromisoformat(self._starts_at_raw)
+        return self._starts_at
+
     @property
     def starts_at_label(self) -> str:
         """Display-friendly date and time."""
         return self.starts_at.strftime("%d %b %Y %H:%M")
 
+    @property
+    def card_key(self) -> tuple[Any, ...]:
+        """Fragment-cache key: the sort key (start time and id) plus every shown field."""
+        return (
+            self.sort_key,
+            self.title,
+            self.location,
+            self.class_from,
+            self.class_to,
+            self.max_players,
+            self.notes,
+        )
+
     @property
     def class_range_label(self) -> str:
         """Display-friendly class range."""
@@ -42,6 +162,65 @@ class Match:
             return format_class(self.class_from)
         return f"{format_class(self.class_from)} to {format_class(self.class_to)}"
 
+    def __repr__(self) -> str:
+        return f"MatchSummary(id={self.id!r}, title={self.title!r})"
+
+
+MatchListItem = Match | MatchSummary
+
+# Attributes rendered on a match card, plus the keys needed for cursors.
+_SUMMARY_ATTRIBUTES = (
+    "SK",
+    "match_id",
+    "title",
+    "starts_at",
+    "location",
+    "class_from",
+    "class_to",
+    "max_players",
+    "notes",
+)
+_SUMMARY_PROJECTION = {
+    # Placeholders sidestep DynamoDB reserved words such as LOCATION.
+    "ProjectionExpression": ", ".join(f"#a{index}" for index in range(len(_SUMMARY_ATTRIBUTES))),
+    "ExpressionAttributeNames": {
+        f"#a{index}": name for index, name in enumerate(_SUMMARY_ATTRIBUTES)
+    },
+}
+
+
+@dataclass(frozen=True)
+class MatchPage:
+    """One page of matches plus opaque cursors for the neighbouring pages."""
+
+    items: list[MatchListItem]
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchCreateResult:
+    """Outcome of :meth:`MatchRepository.create_many`.
+
+    ``failed`` holds the input positions of matches that were not written.
+    """
+
+    created: list[Match]
+    failed: list[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Decoded keyset cursor: fetch items ``after`` or ``before`` a sort key.
+
+    ``window`` holds the inclusive ``SK`` bounds of the listing the cursor
+    came from, so later pages keep that window even once the clock moves on.
+    """
+
+    direction: str
+    sort_key: str
+    window: tuple[str, str] | None = None
+
 
 class MatchRepository(Protocol):
     """Persistence boundary for matches."""
@@ -49,9 +228,33 @@ class MatchRepository(Protocol):
     def create(self, match: Match) -> Match:
         """Persist a match."""
 
+    def create_many(self, matches: Sequence[Match]) -> BatchCreateResult:
+        """Persist several matches, reporting any that could not be written."""
+
     def list(self) -> list[Match]:
         """List stored matches."""
 
+    def list_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> MatchPage:
+        """List one page of matches sorted by date, starting from ``cursor``.
+
+        ``since``/``until`` restrict the page to matches starting in ``[since, until)``.
+        """
+
+    def list_upcoming(self, since: datetime, until: datetime | None = None) -> list[Match]:
+        """List matches starting in ``[since, until)`` sorted by date."""
+
+    def list_by_creator(
+        self, creator_sub: str, limit: int, cursor: str | None = None
+    ) -> MatchPage:
+        """List one page of a user's own matches sorted by date."""
+
     def clear(self) -> None:
         """Clear stored matches. Intended for tests/local development."""
 
@@ -64,12 +267,259 @@ class MatchStorageNotConfiguredError(MatchStorageError):
     """Raised when no match storage backend is configured."""
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or has been tampered with."""
+
+
+# app.config requires the secret outside local development, where one
+# process-local key is enough.
+_cursor_key = (MATCHES_CURSOR_SECRET or secrets.token_hex(32)).encode()
+
+
+def encode_cursor(
+    direction: str, sort_key: str, window: tuple[str, str] | None = None
+) -> str:
+    """Return an opaque, signed cursor for a keyset position."""
+    data: dict[str, Any] = {"d": direction, "k": sort_key}
+    if window is not None:
+        data["w"] = list(window)
+    payload = json.dumps(data, separators=(",", ":")).encode()
+    signature = hmac.new(_cursor_key, payload, hashlib.sha256).digest()[:16]
+    return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+
+def decode_cursor(cursor: str) -> PageCursor:
+    """Verify and decode a cursor produced by :func:`encode_cursor`."""
+    encoded_payload, _, encoded_signature = cursor.partition(".")
+    try:
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError("Invalid page cursor") from exc
+
+    expected = hmac.new(_cursor_key, payload, hashlib.sha256).digest()[:16]
+    if not hmac.compare_digest(signature, expected):
+        raise InvalidCursorError("Invalid page cursor")
+
+    try:
+        data = json.loads(payload)
+        window = data.get("w")
+        position = PageCursor(
+            direction=data["d"],
+            sort_key=data["k"],
+            window=None if window is None else (window[0], window[1]),
+        )
+    except (IndexError, KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid page cursor") from exc
+    if position.direction not in {"after", "before"} or not isinstance(position.sort_key, str):
+        raise InvalidCursorError("Invalid page cursor")
+    if position.window is not None and not all(isinstance(key, str) for key in position.window):
+        raise InvalidCursorError("Invalid page cursor")
+    return position
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode()
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sort_key_range(
+    since: datetime | None, until: datetime | None
+) -> tuple[str, str]:
+    """Return inclusive ``SK`` bounds for matches starting in ``[since, until)``.
+
+    Sort keys continue with ``#<id>`` after the timestamp, so a bare
+    ``START#<until>`` sorts before every match starting exactly at ``until``.
+    ``START$`` sorts after every ``START#...`` key.
+    """
+    lower = f"START#{since.isoformat(timespec='seconds')}" if since else "START#"
+    upper = f"START#{until.isoformat(timespec='seconds')}" if until else "START$"
+    return lower, upper
+
+
+def _page_window(
+    position: PageCursor | None, since: datetime | None, until: datetime | None
+) -> tuple[str, str]:
+    """Return the ``SK`` bounds for a page: the cursor's window, else ``[since, until)``."""
+    if position is not None and position.window is not None:
+        return position.window
+    return _sort_key_range(since, until)
+
+
+def _unique_by_sort_key(items: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Drop adjacent duplicates, e.g. an item caught mid-migration in two partitions."""
+    previous = None
+    for item in items:
+        if item["SK"] != previous:
+            yield item
+        previous = item["SK"]
+
+
+def _check_page_limit(limit: int) -> None:
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"Page size must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def _build_page(
+    items: list[MatchListItem],
+    position: PageCursor | None,
+    has_more: bool,
+    window: tuple[str, str] | None = None,
+) -> MatchPage:
+    """Attach cursors to items fetched in ``position``'s direction.
+
+    ``items`` are in the order they were read, so a ``before`` page arrives
+    newest-first and is flipped back into ascending order here. The cursors
+    carry ``window`` so neighbouring pages are read from the same range.
+    """
+    if position is not None and position.direction == "before":
+        items = items[::-1]
+        return MatchPage(
+            items=items,
+            next_cursor=encode_cursor("after", items[-1].sort_key, window) if items else None,
+            previous_cursor=(
+                encode_cursor("before", items[0].sort_key, window)
+                if items and has_more
+                else None
+            ),
+        )
+    return MatchPage(
+        items=items,
+        next_cursor=(
+            encode_cursor("after", items[-1].sort_key, window) if items and has_more else None
+        ),
+        previous_cursor=(
+            encode_cursor("before", items[0].sort_key, window) if items and position else None
+        ),
+    )
+
+
+class _SortedIndex:
+    """Immutable sorted sequence of matches keyed by ``sort_key``.
+
+    Matches are stored in chunks of at most ``CHUNK_SIZE`` so an insert copies
+    one chunk plus the chunk directory rather than the whole sequence. Each
+    insert returns a new index; existing instances never change, so readers can
+    use one without locking while writers publish its successor.
+    """
+
+    CHUNK_SIZE = 512
+
+    __slots__ = ("_chunks", "_keys", "_maxes", "_size")
+
+    def __init__(
+        self,
+        chunks: tuple[tuple[Match, ...], ...] = (),
+        keys: tuple[tuple[str, ...], ...] = (),
+        maxes: tuple[str, ...] = (),
+        size: int = 0,
+    ) -> None:
+        self._chunks = chunks
+        self._keys = keys
+        self._maxes = maxes
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, match: Match, key: str) -> _SortedIndex:
+        """Return a new index that also holds ``match`` under ``key``."""
+        if not self._chunks:
+            return _SortedIndex(((match,),), ((key,),), (key,), 1)
+
+        index = min(bisect_left(self._maxes, key), len(self._chunks) - 1)
+        chunk, chunk_keys = self._chunks[index], self._keys[index]
+        position = bisect_right(chunk_keys, key)
+        new_chunk = chunk[:position] + (match,) + chunk[position:]
+        new_keys = chunk_keys[:position] + (key,) + chunk_keys[position:]
+
+        if len(new_chunk) > self.CHUNK_SIZE:
+            half = len(new_chunk) // 2
+            chunks = (new_chunk[:half], new_chunk[half:])
+            keys = (new_keys[:half], new_keys[half:])
+            maxes = (new_keys[half - 1], new_keys[-1])
+        else:
+            chunks, keys, maxes = (new_chunk,), (new_keys,), (new_keys[-1],)
+
+        after = index + 1
+        return _SortedIndex(
+            self._chunks[:index] + chunks + self._chunks[after:],
+            self._keys[:index] + keys + self._keys[after:],
+            self._maxes[:index] + maxes + self._maxes[after:],
+            self._size + 1,
+        )
+
+    def irange(
+        self,
+        minimum: str,
+        maximum: str,
+        *,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[Match]:
+        """Yield matches whose keys fall between ``minimum`` and ``maximum``."""
+        if not self._chunks:
+            return
+        if reverse:
+            yield from self._irange_reverse(minimum, maximum, inclusive)
+            return
+
+        find_start = bisect_left if inclusive[0] else bisect_right
+        index = bisect_left(self._maxes, minimum)
+        if index == len(self._chunks):
+            return
+        position = find_start(self._keys[index], minimum)
+        for chunk_index in range(index, len(self._chunks)):
+            chunk_keys = self._keys[chunk_index]
+            chunk = self._chunks[chunk_index]
+            for offset in range(position, len(chunk)):
+                key = chunk_keys[offset]
+                if key > maximum or (key == maximum and not inclusive[1]):
+                    return
+                yield chunk[offset]
+            position = 0
+
+    def _irange_reverse(
+        self, minimum: str, maximum: str, inclusive: tuple[bool, bool]
+    ) -> Iterator[Match]:
+        find_end = bisect_right if inclusive[1] else bisect_left
+        index = bisect_left(self._maxes, maximum)
+        if index == len(self._chunks):
+            index -= 1
+            end = len(self._chunks[index])
+        else:
+            end = find_end(self._keys[index], maximum)
+        for chunk_index in range(index, -1, -1):
+            chunk_keys = self._keys[chunk_index]
+            chunk = self._chunks[chunk_index]
+            for offset in range(end - 1, -1, -1):
+                key = chunk_keys[offset]
+                if key < minimum or (key == minimum and not inclusive[0]):
+                    return
+                yield chunk[offset]
+            if chunk_index:
+                end = len(self._chunks[chunk_index - 1])
+
+
 class InMemoryMatchRepository:
-    """In-memory repository used for tests and local fallback."""
+    """In-memory repository used for tests and local fallback.
+
+    Matches are kept sorted on insert in a global index plus per-creator and
+    per-class indexes. Writers serialize on a lock and publish new immutable
+    indexes; readers pick up the current ones without locking.
+    """
 
     def __init__(self) -> None:
-        self._matches: list[Match] = []
         self._lock = Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._matches = _SortedIndex()
+        self._by_creator: dict[str, _SortedIndex] = {}
+        self._by_class: dict[str, _SortedIndex] = {}
         self._next_id = count(1)
 
     def create(self, match: Match) -> Match:
@@ -85,31 +535,132 @@ class InMemoryMatchRepository:
                 max_players=match.max_players,
                 notes=match.notes,
             )
-            self._matches.append(persisted)
+            key = persisted.sort_key
+            self._by_creator[persisted.creator_sub] = self._by_creator.get(
+                persisted.creator_sub, _SortedIndex()
+            ).insert(persisted, key)
+            for class_value in _class_span(persisted.class_from, persisted.class_to):
+                self._by_class[class_value] = self._by_class.get(
+                    class_value, _SortedIndex()
+                ).insert(persisted, key)
+            self._matches = self._matches.insert(persisted, key)
             return persisted
 
+    def create_many(self, matches: Sequence[Match]) -> BatchCreateResult:
+        return BatchCreateResult(created=[self.create(match) for match in matches])
+
     def list(self) -> list[Match]:
-        with self._lock:
-            return sorted(self._matches, key=lambda match: (match.starts_at, match.id))
+        return list(self._matches.irange(*_sort_key_range(None, None)))
+
+    def list_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> MatchPage:
+        _check_page_limit(limit)
+        position = decode_cursor(cursor) if cursor else None
+        return _page_index(self._matches, limit, position, *_page_window(position, since, until))
+
+    def list_upcoming(self, since: datetime, until: datetime | None = None) -> list[Match]:
+        return list(self._matches.irange(*_sort_key_range(since, until)))
+
+    def list_by_creator(
+        self, creator_sub: str, limit: int, cursor: str | None = None
+    ) -> MatchPage:
+        _check_page_limit(limit)
+        position = decode_cursor(cursor) if cursor else None
+        index = self._by_creator.get(creator_sub, _SortedIndex())
+        return _page_index(index, limit, position, *_sort_key_range(None, None))
+
+    def list_by_class(
+        self, class_value: str, since: datetime | None = None, until: datetime | None = None
+    ) -> list[Match]:
+        """List matches open to ``class_value`` starting in ``[since, until)``."""
+        index = self._by_class.get(class_value, _SortedIndex())
+        return list(index.irange(*_sort_key_range(since, until)))
 
     def clear(self) -> None:
         with self._lock:
-            self._matches.clear()
-            self._next_id = count(1)
+            self._reset()
+
+
+def _class_span(class_from: str, class_to: str) -> tuple[str, ...]:
+    return CLASS_OPTIONS[CLASS_OPTIONS.index(class_from) : CLASS_OPTIONS.index(class_to) + 1]
+
+
+def _page_index(
+    index: _SortedIndex, limit: int, position: PageCursor | None, lower: str, upper: str
+) -> MatchPage:
+    """Read one page from a sorted index within inclusive ``[lower, upper]`` keys."""
+    if position is not None and position.direction == "before":
+        if position.sort_key <= upper:
+            matches = index.irange(lower, position.sort_key, inclusive=(True, False), reverse=True)
+        else:
+            matches = index.irange(lower, upper, reverse=True)
+    elif position is not None and position.sort_key >= lower:
+        matches = index.irange(position.sort_key, upper, inclusive=(False, True))
+    else:
+        matches = index.irange(lower, upper)
+
+    selected = list(islice(matches, limit + 1))
+    return _build_page(selected[:limit], position, len(selected) > limit, (lower, upper))
 
 
 class DynamoDBMatchRepository:
-    """DynamoDB repository for production match storage."""
+    """DynamoDB repository for production match storage.
+
+    With ``shard_count > 1`` matches are written across ``MATCH#0..N-1`` so no
+    single partition key takes every write. Reads query each shard in parallel
+    and merge the already-sorted results by ``SK``. ``read_legacy_partition``
+    also reads the unsharded ``MATCH`` partition while
+    :meth:`migrate_to_shards` has not yet run.
+    """
 
     partition_key = "MATCH"
 
-    def __init__(self, table: Any) -> None:
+    def __init__(
+        self, table: Any, shard_count: int = 1, read_legacy_partition: bool = False
+    ) -> None:
+        if shard_count < 1:
+            raise ValueError("Shard count must be at least 1")
         self.table = table
+        self.shard_count = shard_count
+        self.read_legacy_partition = read_legacy_partition and shard_count > 1
+        # Built up front so concurrent first reads share one pool; threads
+        # start lazily. One per shard plus the legacy partition.
+        self._executor = (
+            ThreadPoolExecutor(max_workers=shard_count + 1, thread_name_prefix="match-shards")
+            if shard_count > 1
+            else None
+        )
+        self.sleep: Callable[[float], None] = time.sleep
 
     @classmethod
-    def from_table_name(cls, table_name: str) -> DynamoDBMatchRepository:
+    def from_table_name(
+        cls, table_name: str, shard_count: int = 1, read_legacy_partition: bool = False
+    ) -> DynamoDBMatchRepository:
         table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(table_name)
-        return cls(table)
+        return cls(table, shard_count, read_legacy_partition)
+
+    @property
+    def read_partitions(self) -> list[str]:
+        """Partition keys that hold matches under the current layout."""
+        if self.shard_count == 1:
+            return [self.partition_key]
+        partitions = [f"{self.partition_key}#{shard}" for shard in range(self.shard_count)]
+        if self.read_legacy_partition:
+            partitions.append(self.partition_key)
+        return partitions
+
+    def partition_for(self, match_id: str) -> str:
+        """Return the partition key a match is written to."""
+        if self.shard_count == 1:
+            return self.partition_key
+        shard = zlib.crc32(match_id.encode()) % self.shard_count
+        return f"{self.partition_key}#{shard}"
 
     def create(self, match: Match) -> Match:
         match_id = uuid4().hex
@@ -132,27 +683,221 @@ class DynamoDBMatchRepository:
             ) from exc
         return persisted
 
-    def list(self) -> list[Match]:
+    def create_many(self, matches: Sequence[Match]) -> BatchCreateResult:
+        """Write matches with ``BatchWriteItem`` in groups of 25.
+
+        Items DynamoDB returns as ``UnprocessedItems`` are retried with full
+        jitter backoff; any still unwritten after the last attempt are
+        reported in ``failed``.
+        """
+        persisted = [replace(match, id=uuid4().hex) for match in matches]
+        created: list[Match] = []
+        failed: list[int] = []
+        for start in range(0, len(persisted), BATCH_WRITE_SIZE):
+            group = persisted[start : start + BATCH_WRITE_SIZE]
+            unwritten = self._batch_put([self._to_item(match) for match in group])
+            for offset, match in enumerate(group):
+                if match.id in unwritten:
+                    failed.append(start + offset)
+                else:
+                    created.append(match)
+        return BatchCreateResult(created=created, failed=failed)
+
+    def _batch_put(self, items: list[dict[str, Any]]) -> set[str]:
+        """Put up to 25 items; return the match ids that were never written."""
+        table_name = self.table.name
+        # The low-level client wants typed attribute values ({"S": ...}).
+        write_requests = [
+            {
+                "PutRequest": {
+                    "Item": {key: _serializer.serialize(value) for key, value in item.items()}
+                }
+            }
+            for item in items
+        ]
         try:
-            response = self.table.query(
-                KeyConditionExpression=Key("PK").eq(self.partition_key),
-                ScanIndexForward=True,
-            )
+            for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+                response = self.table.meta.client.batch_write_item(
+                    RequestItems={table_name: write_requests}
+                )
+                write_requests = response.get("UnprocessedItems", {}).get(table_name, [])
+                if not write_requests:
+                    return set()
+                if attempt + 1 < BATCH_WRITE_MAX_ATTEMPTS:
+                    backoff = min(BATCH_WRITE_MAX_BACKOFF, BATCH_WRITE_BASE_BACKOFF * 2**attempt)
+                    self.sleep(random.uniform(0, backoff))
         except (BotoCoreError, ClientError) as exc:
             raise MatchStorageError(
-                "Unable to load matches. Check DynamoDB table access and AWS credentials."
+                "Unable to save matches. Check DynamoDB table access and AWS credentials."
             ) from exc
-        items = response.get("Items", [])
+        return {request["PutRequest"]["Item"]["match_id"]["S"] for request in write_requests}
+
+    def list(self) -> list[Match]:
+        items = self._query_range(*_sort_key_range(None, None))
         return [self._from_item(item) for item in items]
 
+    def list_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> MatchPage:
+        _check_page_limit(limit)
+        position = decode_cursor(cursor) if cursor else None
+        lower, upper = _page_window(position, since, until)
+        forward = position is None or position.direction == "after"
+        start_key = position.sort_key if position else None
+        # DynamoDB rejects a start key outside the key condition, so clamp it
+        # the way _page_index does for the in-memory backend.
+        if start_key is not None and (start_key > upper if forward else start_key < lower):
+            return _build_page([], position, False, (lower, upper))
+        if start_key is not None and (start_key < lower if forward else start_key > upper):
+            start_key = None
+
+        # Read one extra item so we know whether another page exists.
+        items = self._query_range(
+            lower,
+            upper,
+            forward=forward,
+            start_key=start_key,
+            limit=limit + 1,
+            projection=_SUMMARY_PROJECTION,
+        )
+        matches: list[MatchListItem] = [MatchSummary(item) for item in items[:limit]]
+        return _build_page(matches, position, len(items) > limit, (lower, upper))
+
+    def list_upcoming(self, since: datetime, until: datetime | None = None) -> list[Match]:
+        items = self._query_range(*_sort_key_range(since, until))
+        return [self._from_item(item) for item in items]
+
+    def list_by_creator(
+        self, creator_sub: str, limit: int, cursor: str | None = None
+    ) -> MatchPage:
+        _check_page_limit(limit)
+        position = decode_cursor(cursor) if cursor else None
+        user_key = f"USER#{creator_sub}"
+        query: dict[str, Any] = {
+            "IndexName": "GSI1",
+            "KeyConditionExpression": Key("GSI1PK").eq(user_key),
+            "ScanIndexForward": position is None or position.direction == "after",
+            **_SUMMARY_PROJECTION,
+        }
+        if position is not None:
+            # GSI start keys carry the base table key too; the match id ends the SK.
+            match_id = position.sort_key.rsplit("#", 1)[-1]
+            query["ExclusiveStartKey"] = {
+                "GSI1PK": user_key,
+                "GSI1SK": position.sort_key,
+                "PK": self.partition_for(match_id),
+                "SK": position.sort_key,
+            }
+
+        items = self._query(limit=limit + 1, **query)
+        matches: list[MatchListItem] = [MatchSummary(item) for item in items[:limit]]
+        return _build_page(matches, position, len(items) > limit)
+
     def clear(self) -> None:
         raise RuntimeError("Clearing DynamoDB matches from the app is not supported")
 
+    def migrate_to_shards(self) -> int:
+        """Move items from the unsharded ``MATCH`` partition onto their shards.
+
+        Safe to re-run: each item is copied before its legacy copy is deleted.
+        The partition is read one query page at a time, so memory stays flat
+        however many matches it holds. Returns the number of items moved.
+        """
+        if self.shard_count == 1:
+            raise ValueError("Set a shard count above 1 before migrating matches")
+
+        moved = 0
+        try:
+            with self.table.batch_writer() as batch:
+                for items in self._query_pages(
+                    KeyConditionExpression=Key("PK").eq(self.partition_key),
+                    ScanIndexForward=True,
+                ):
+                    for item in items:
+                        batch.put_item(
+                            Item={**item, "PK": self.partition_for(str(item["match_id"]))}
+                        )
+                        batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+                        moved += 1
+        except (BotoCoreError, ClientError) as exc:
+            raise MatchStorageError("Unable to migrate matches onto shards.") from exc
+        return moved
+
+    def _query_range(
+        self,
+        lower: str,
+        upper: str,
+        *,
+        forward: bool = True,
+        start_key: str | None = None,
+        limit: int | None = None,
+        projection: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Query ``SK`` between bounds on every read partition, merged by ``SK``."""
+
+        def query_partition(partition: str) -> list[dict[str, Any]]:
+            query: dict[str, Any] = {
+                "KeyConditionExpression": (
+                    Key("PK").eq(partition) & Key("SK").between(lower, upper)
+                ),
+                "ScanIndexForward": forward,
+                **(projection or {}),
+            }
+            if start_key is not None:
+                query["ExclusiveStartKey"] = {"PK": partition, "SK": start_key}
+            return self._query(limit=limit, **query)
+
+        partitions = self.read_partitions
+        if self._executor is None:
+            return query_partition(partitions[0])
+
+        results = list(self._executor.map(query_partition, partitions))
+        merged = heapq.merge(*results, key=itemgetter("SK"), reverse=not forward)
+        return list(islice(_unique_by_sort_key(merged), limit))
+
+    def _query(self, limit: int | None = None, **query: Any) -> list[dict[str, Any]]:
+        """Run a query, following ``LastEvaluatedKey`` until ``limit`` items are read.
+
+        DynamoDB stops each response at 1 MB, so a single call can silently
+        return a truncated result.
+        """
+        items: list[dict[str, Any]] = []
+        for page in self._query_pages(limit, **query):
+            items.extend(page)
+        return items
+
+    def _query_pages(
+        self, limit: int | None = None, **query: Any
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Yield the items of each query response until ``limit`` items are read."""
+        read = 0
+        try:
+            while True:
+                if limit is not None:
+                    query["Limit"] = limit - read
+                response = self.table.query(**query)
+                items = response.get("Items", [])
+                read += len(items)
+                yield items
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key or (limit is not None and read >= limit):
+                    return
+                query["ExclusiveStartKey"] = last_key
+        except (BotoCoreError, ClientError) as exc:
+            raise MatchStorageError(
+                "Unable to load matches. Check DynamoDB table access and AWS credentials."
+            ) from exc
+
     def _to_item(self, match: Match) -> dict[str, Any]:
         starts_at_value = match.starts_at.isoformat(timespec="seconds")
-        sort_key = f"START#{starts_at_value}#{match.id}"
+        sort_key = match.sort_key
         return {
-            "PK": self.partition_key,
+            "PK": self.partition_for(match.id),
             "SK": sort_key,
             "GSI1PK": f"USER#{match.creator_sub}",
             "GSI1SK": sort_key,
@@ -181,6 +926,252 @@ class DynamoDBMatchRepository:
         )
 
 
+@dataclass
+class _CacheEntry:
+    value: Any
+    loaded_at: float
+    generation: int
+
+
+class CachedMatchRepository:
+    """Read-through cache around any :class:`MatchRepository`.
+
+    Reads are cached per argument tuple for ``ttl_seconds``. For a further
+    ``stale_seconds`` the old result is served while one background thread
+    revalidates it. If the backend raises :class:`MatchStorageError`, results up
+    to ``stale_if_error_seconds`` old are served instead of failing; time-window
+    reads fall back to the last result for any ``since``, because the route
+    moves ``since`` every minute. Writes through this wrapper invalidate every
+    entry; other workers rely on the TTL.
+    """
+
+    def __init__(
+        self,
+        repository: MatchRepository,
+        ttl_seconds: float,
+        *,
+        stale_seconds: float = 0.0,
+        stale_if_error_seconds: float = 0.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.repository = repository
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.stale_if_error_seconds = stale_if_error_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[Any, ...], _CacheEntry] = OrderedDict()
+        self._fallbacks: OrderedDict[tuple[Any, ...], _CacheEntry] = OrderedDict()
+        self._refreshing: set[tuple[Any, ...]] = set()
+        self._generation = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors_served_stale = 0
+
+    def create(self, match: Match) -> Match:
+        persisted = self.repository.create(match)
+        self.invalidate()
+        return persisted
+
+    def create_many(self, matches: Sequence[Match]) -> BatchCreateResult:
+        try:
+            return self.repository.create_many(matches)
+        finally:
+            self.invalidate()
+
+    def list(self) -> list[Match]:
+        return self._read(("list",), self.repository.list)
+
+    def list_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> MatchPage:
+        return self._read(
+            ("page", limit, cursor, since, until),
+            lambda: self.repository.list_page(limit, cursor, since=since, until=until),
+            fallback_key=("page", limit, cursor, until),
+        )
+
+    def list_upcoming(self, since: datetime, until: datetime | None = None) -> list[Match]:
+        return self._read(
+            ("upcoming", since, until),
+            lambda: self.repository.list_upcoming(since, until),
+            fallback_key=("upcoming", until),
+        )
+
+    def list_by_creator(
+        self, creator_sub: str, limit: int, cursor: str | None = None
+    ) -> MatchPage:
+        return self._read(
+            ("creator", creator_sub, limit, cursor),
+            lambda: self.repository.list_by_creator(creator_sub, limit, cursor),
+        )
+
+    def clear(self) -> None:
+        self.repository.clear()
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop every cached result, including ones still being revalidated."""
+        with self._lock:
+            self._entries.clear()
+            self._fallbacks.clear()
+            self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for sizing the TTL."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "errors_served_stale": self.errors_served_stale,
+                "entries": len(self._entries),
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _read(
+        self,
+        key: tuple[Any, ...],
+        load: Callable[[], Any],
+        *,
+        fallback_key: tuple[Any, ...] | None = None,
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            age = self._clock() - entry.loaded_at if entry else 0.0
+            generation = self._generation
+            if entry is not None and age < self.ttl_seconds:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if entry is not None and age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                start_refresh = key not in self._refreshing
+                self._refreshing.add(key)
+                stale_value = entry.value
+            else:
+                self.misses += 1
+                start_refresh = None
+
+        if start_refresh is not None:
+            if start_refresh:
+                Thread(
+                    target=self._revalidate,
+                    args=(key, load, generation, fallback_key),
+                    name="match-cache-revalidate",
+                    daemon=True,
+                ).start()
+            return stale_value
+
+        try:
+            value = load()
+        except MatchStorageError:
+            with self._lock:
+                if fallback_key is not None and fallback_key in self._fallbacks:
+                    fallback = self._fallbacks[fallback_key]
+                    if entry is None or fallback.loaded_at > entry.loaded_at:
+                        entry = fallback
+                if entry is None or (
+                    self._clock() - entry.loaded_at
+                    >= self.ttl_seconds + self.stale_if_error_seconds
+                ):
+                    raise
+                self.errors_served_stale += 1
+            logger.warning("Serving stale matches after a storage error", exc_info=True)
+            return entry.value
+        self._store(key, value, generation, fallback_key)
+        return value
+
+    def _revalidate(
+        self,
+        key: tuple[Any, ...],
+        load: Callable[[], Any],
+        generation: int,
+        fallback_key: tuple[Any, ...] | None = None,
+    ) -> None:
+        try:
+            self._store(key, load(), generation, fallback_key)
+        except MatchStorageError:
+            logger.warning("Background match cache refresh failed", exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(
+        self,
+        key: tuple[Any, ...],
+        value: Any,
+        generation: int,
+        fallback_key: tuple[Any, ...] | None = None,
+    ) -> None:
+        with self._lock:
+            # A write invalidated the cache while we were loading; don't resurrect it.
+            if generation != self._generation:
+                return
+            entry = _CacheEntry(value, self._clock(), generation)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if fallback_key is not None:
+                self._fallbacks[fallback_key] = entry
+                self._fallbacks.move_to_end(fallback_key)
+                while len(self._fallbacks) > self.max_entries:
+                    self._fallbacks.popitem(last=False)
+
+
+class AsyncMatchRepository:
+    """Async facade that runs a :class:`MatchRepository` on the blocking I/O pool.
+
+    Routes await these methods so slow DynamoDB calls never block the event
+    loop. A saturated pool surfaces as :class:`MatchStorageError`.
+    """
+
+    def __init__(self, repository: MatchRepository) -> None:
+        self.repository = repository
+
+    async def create(self, match: Match) -> Match:
+        return await self._run(self.repository.create, match)
+
+    async def list_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> MatchPage:
+        return await self._run(
+            self.repository.list_page, limit, cursor, since=since, until=until
+        )
+
+    async def list_upcoming(
+        self, since: datetime, until: datetime | None = None
+    ) -> list[Match]:
+        return await self._run(self.repository.list_upcoming, since, until)
+
+    async def list_by_creator(
+        self, creator_sub: str, limit: int, cursor: str | None = None
+    ) -> MatchPage:
+        return await self._run(self.repository.list_by_creator, creator_sub, limit, cursor)
+
+    async def _run(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await run_blocking(func, *args, **kwargs)
+        except BlockingPoolSaturatedError as exc:
+            raise MatchStorageError("Match storage is busy. Please try again shortly.") from exc
+
+
 CLASS_OPTIONS = ("reception", "1", "2", "3", "4", "5", "6")
 
 _repository: MatchRepository | None = None
@@ -198,7 +1189,11 @@ def get_match_repository() -> MatchRepository:
     global _repository
     if _repository is None:
         if MATCHES_TABLE_NAME:
-            _repository = DynamoDBMatchRepository.from_table_name(MATCHES_TABLE_NAME)
+            _repository = DynamoDBMatchRepository.from_table_name(
+                MATCHES_TABLE_NAME,
+                shard_count=MATCHES_SHARD_COUNT,
+                read_legacy_partition=MATCHES_READ_LEGACY_PARTITION,
+            )
         elif MATCHES_USE_MEMORY:
             _repository = InMemoryMatchRepository()
         else:
@@ -206,9 +1201,23 @@ def get_match_repository() -> MatchRepository:
                 "Match storage is not configured. Set MATCHES_TABLE_NAME to use "
                 "DynamoDB, or set MATCHES_USE_MEMORY=true for local-only development."
             )
+        if MATCHES_CACHE_TTL_SECONDS > 0:
+            cached = CachedMatchRepository(
+                _repository,
+                MATCHES_CACHE_TTL_SECONDS,
+                stale_seconds=MATCHES_CACHE_STALE_SECONDS,
+                stale_if_error_seconds=MATCHES_CACHE_STALE_IF_ERROR_SECONDS,
+            )
+            register_metrics("match_cache", cached.stats)
+            _repository = cached
     return _repository
 
 
+def get_async_match_repository() -> AsyncMatchRepository:
+    """Return the configured match repository behind an async facade."""
+    return AsyncMatchRepository(get_match_repository())
+
+
 def set_match_repository(repository: MatchRepository | None) -> None:
     """Override the match repository. Intended for tests."""
     global _repository
@@ -240,11 +1249,81 @@ def create_match(
     return get_match_repository().create(match)
 
 
+async def create_match_async(
+    *,
+    creator_sub: str,
+    title: str,
+    starts_at: datetime,
+    location: str,
+    class_from: str,
+    class_to: str,
+    max_players: int,
+    notes: str,
+) -> Match:
+    """Create and store a match without blocking the event loop."""
+    match = _build_match(
+        creator_sub=creator_sub,
+        title=title,
+        starts_at=starts_at,
+        location=location,
+        class_from=class_from,
+        class_to=class_to,
+        max_players=max_players,
+        notes=notes,
+    )
+    return await get_async_match_repository().create(match)
+
+
 def list_matches() -> list[Match]:
     """Return matches sorted by date."""
     return get_match_repository().list()
 
 
+def list_upcoming_matches(
+    since: datetime | None = None, until: datetime | None = None
+) -> list[Match]:
+    """Return matches starting from ``since`` (default: now) sorted by date."""
+    return get_match_repository().list_upcoming(since or datetime.now(), until)
+
+
+def list_matches_page(
+    *,
+    limit: int,
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> MatchPage:
+    """Return one page of matches sorted by date, optionally within a time window."""
+    return get_match_repository().list_page(limit, cursor, since=since, until=until)
+
+
+def list_my_matches(
+    creator_sub: str, *, limit: int, cursor: str | None = None
+) -> MatchPage:
+    """Return one page of the matches a user created, sorted by date."""
+    return get_match_repository().list_by_creator(creator_sub, limit, cursor)
+
+
+async def list_matches_page_async(
+    *,
+    limit: int,
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> MatchPage:
+    """Async variant of :func:`list_matches_page`."""
+    return await get_async_match_repository().list_page(
+        limit, cursor, since=since, until=until
+    )
+
+
+async def list_my_matches_async(
+    creator_sub: str, *, limit: int, cursor: str | None = None
+) -> MatchPage:
+    """Async variant of :func:`list_my_matches`."""
+    return await get_async_match_repository().list_by_creator(creator_sub, limit, cursor)
+
+
 def clear_matches() -> None:
     """Clear all matches. Intended for tests and local development reset hooks."""
     get_match_repository().clear()
@@ -5,11 +5,32 @@ from __future__ import annotations
 import os
 from typing import Any
 
-import requests
+from app import http_client
+from app.cache import TTLCache
+from app.circuit_breaker import get_breaker
+from app.config import (
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    USER_SETTINGS_CACHE_MISSING_TTL_SECONDS,
+    USER_SETTINGS_CACHE_SIZE,
+    USER_SETTINGS_CACHE_TTL_SECONDS,
+    USER_SETTINGS_TIMEOUT_SECONDS,
+)
+from app.executor import run_blocking
+from app.metrics import register_metrics
 
 AWS_REGION = os.getenv("AWS_REGION", "eu-west-2")
 API_GATEWAY_ID = os.getenv("API_GATEWAY_ID")
 
+# Settings per sub. Reads fill it, saves write through it, and a 404 is
+# cached as {} for USER_SETTINGS_CACHE_MISSING_TTL_SECONDS.
+settings_cache: TTLCache[dict[str, Any]] = TTLCache(
+    USER_SETTINGS_CACHE_SIZE, USER_SETTINGS_CACHE_TTL_SECONDS
+)
+register_metrics("user_settings_cache", settings_cache.stats)
+
+# Opens when API Gateway keeps failing, so pages stop waiting on it.
+settings_breaker = get_breaker("user_settings_api")
+
 
 def _api_base() -> str:
     if not API_GATEWAY_ID:
@@ -17,19 +38,71 @@ def _api_base() -> str:
     return f"https://{API_GATEWAY_ID}.execute-api.{AWS_REGION}.amazonaws.com"
 
 
+def cached_user_settings(sub: str) -> dict[str, Any] | None:
+    """Return cached settings for ``sub`` without any I/O, or ``None`` on a miss."""
+    cached = settings_cache.get(sub)
+    return None if cached is None else dict(cached)
+
+
 def fetch_user_settings(sub: str) -> dict[str, Any]:
     """Fetch saved settings for a user."""
+    cached = cached_user_settings(sub)
+    if cached is not None:
+        return cached
+    return _load_user_settings(sub)
+
+
+def _load_user_settings(sub: str) -> dict[str, Any]:
     url = f"{_api_base()}/user/{sub}"
-    resp = requests.get(url, timeout=10)
-    if resp.status_code == 404:
-        return {}
-    resp.raise_for_status()
-    return resp.json()
+    with settings_breaker.guard():
+        # The page may stop waiting sooner, but that does not stop this call:
+        # the read timeout is what bounds how long it holds a blocking thread.
+        resp = http_client.get(
+            url, timeout=(HTTP_CONNECT_TIMEOUT_SECONDS, USER_SETTINGS_TIMEOUT_SECONDS)
+        )
+        if resp.status_code == 404:
+            settings_cache.set(sub, {}, ttl_seconds=USER_SETTINGS_CACHE_MISSING_TTL_SECONDS)
+            return {}
+        resp.raise_for_status()
+    settings = resp.json()
+    settings_cache.set(sub, dict(settings))
+    return settings
 
 
 def save_user_settings(sub: str, nickname: str, preferred_class: str) -> None:
     """Persist user settings."""
     url = f"{_api_base()}/user/{sub}"
     payload = {"nickname": nickname, "preferred_class": preferred_class}
-    resp = requests.post(url, json=payload, timeout=10)
-    resp.raise_for_status()
+    try:
+        with settings_breaker.guard():
+            resp = http_client.post(url, json=payload)
+            resp.raise_for_status()
+    except Exception:
+        # The write may or may not have landed; read it back next time.
+        settings_cache.pop(sub)
+        raise
+    previous = settings_cache.get(sub) or {}
+    settings_cache.set(sub, {**previous, **payload})
+
+
+def invalidate_user_settings(sub: str) -> None:
+    """Drop cached settings so the next read goes to API Gateway."""
+    settings_cache.pop(sub)
+
+
+async def fetch_user_settings_async(sub: str) -> dict[str, Any]:
+    """Fetch saved settings, using the blocking I/O pool only on a cache miss.
+
+    Raises :class:`~app.circuit_breaker.CircuitOpenError` at once while the
+    settings API's breaker is open.
+    """
+    cached = cached_user_settings(sub)
+    if cached is not None:
+        return cached
+    settings_breaker.fail_fast()
+    return await run_blocking(_load_user_settings, sub)
+
+
+async def save_user_settings_async(sub: str, nickname: str, preferred_class: str) -> None:
+    """Persist user settings on the blocking I/O pool."""
+    await run_blocking(save_user_settings, sub, nickname, preferred_class)
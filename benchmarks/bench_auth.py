@@ -0,0 +1,300 @@
+"""Cost of authentication per request: cold, warm and expired tokens.
+
+Generates a local RSA key, serves its public half through a stubbed
+``get_jwks`` and mints Cognito-shaped RS256 access tokens, so the full
+verification path runs offline. Each path is measured at three layers:
+
+* ``get_current_user`` called directly,
+* ``RefreshTokenMiddleware`` around an empty ASGI app,
+* a full ``/matches`` request through ``app.main.app``.
+
+Paths: ``cold`` sends a token the worker has never seen, ``warm`` repeats one
+token, and ``expired`` sends an expired access cookie plus a refresh token
+that a stubbed Cognito exchanges for a fresh token.
+
+    python -m benchmarks.bench_auth
+    python -m benchmarks.bench_auth --save auth-baseline.json
+    python -m benchmarks.bench_auth --baseline auth-baseline.json --max-regression 0.2
+    python -m benchmarks.bench_auth --no-token-cache
+
+With ``--baseline`` the run exits non-zero when any scenario's ops/sec falls
+more than ``--max-regression`` below the saved numbers.
+"""
+
+from __future__ import annotations
+
+import os
+
+# Real token verification needs the Cognito settings and no local bypass.
+os.environ["LOCAL_AUTH_ENABLED"] = "false"
+os.environ.setdefault("AWS_REGION", "eu-west-2")
+os.environ.setdefault("COGNITO_REGION", "eu-west-2")
+os.environ.setdefault("COGNITO_USER_POOL_ID", "bench_pool")
+os.environ.setdefault("COGNITO_APP_CLIENT_ID", "bench_client")
+os.environ.setdefault("COGNITO_APP_CLIENT_SECRET", "bench_secret")
+os.environ.setdefault("COGNITO_REDIRECT_URI", "http://testserver/")
+os.environ.setdefault("COGNITO_AUTH_URL_BASE", "https://example.com/login")
+os.environ.setdefault("COGNITO_SCOPE", "openid")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import logging  # noqa: E402
+import statistics  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+import uuid  # noqa: E402
+from collections.abc import Awaitable, Callable, Sequence  # noqa: E402
+from dataclasses import dataclass  # noqa: E402
+from typing import Any  # noqa: E402
+
+import httpx  # noqa: E402
+import rsa  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.types import Receive, Scope, Send  # noqa: E402
+
+from app.auth import cognito  # noqa: E402
+from app.auth import dependencies  # noqa: E402
+from app.auth.cookies import ACCESS_TOKEN_COOKIE, REFRESH_TOKEN_COOKIE  # noqa: E402
+from app.auth.middleware import RefreshTokenMiddleware  # noqa: E402
+from app.auth.refresh import refresh_coordinator  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.matches import InMemoryMatchRepository, set_match_repository  # noqa: E402
+
+KID = "bench-key"
+WARMUP = 20
+PATHS = ("cold", "warm", "expired")
+
+
+@dataclass(frozen=True)
+class Credentials:
+    """Cookies for one request, plus the token a refresh will hand out."""
+
+    access_token: str
+    refresh_token: str | None = None
+    refreshed_token: str | None = None
+
+    @property
+    def cookie_header(self) -> str:
+        cookie = f"{ACCESS_TOKEN_COOKIE}={self.access_token}"
+        if self.refresh_token:
+            cookie += f"; {REFRESH_TOKEN_COOKIE}={self.refresh_token}"
+        return cookie
+
+
+class TokenMinter:
+    """RS256 tokens signed with a throwaway key and the matching JWKS."""
+
+    def __init__(self, bits: int = 2048) -> None:
+        _, private_key = rsa.newkeys(bits)
+        # Parsing the PEM is slow, so the signing key is built once.
+        self.signing_key = jwk.construct(private_key.save_pkcs1().decode(), "RS256")
+        public_jwk = self.signing_key.public_key().to_dict()
+        self.jwks = {"keys": [{**public_jwk, "kid": KID, "alg": "RS256", "use": "sig"}]}
+
+    def access_token(self, *, expires_in: int = 3600) -> str:
+        now = int(time.time())
+        claims = {
+            "sub": "bench-user",
+            "username": "bench-user",
+            "aud": dependencies.CLIENT_ID,
+            "token_use": "access",
+            "iat": now,
+            "exp": now + expires_in,
+            "jti": uuid.uuid4().hex,
+        }
+        return jwt.encode(claims, self.signing_key, algorithm="RS256", headers={"kid": KID})
+
+    def credentials(self, path: str, count: int) -> list[Credentials]:
+        """Pre-mint ``count`` credentials so signing stays out of the timings."""
+        if path == "warm":
+            return [Credentials(self.access_token())] * count
+        if path == "cold":
+            return [Credentials(self.access_token()) for _ in range(count)]
+        return [
+            Credentials(
+                self.access_token(expires_in=-60),
+                refresh_token=uuid.uuid4().hex,
+                refreshed_token=self.access_token(),
+            )
+            for _ in range(count)
+        ]
+
+
+def install_stubs(minter: TokenMinter, credentials: list[Credentials]) -> None:
+    """Point JWKS, user attributes and the token endpoint at local stand-ins."""
+    refreshed = {c.refresh_token: c.refreshed_token for c in credentials if c.refresh_token}
+
+    async def refresh_access_token_async(refresh_token: str) -> dict[str, Any]:
+        return {"access_token": refreshed[refresh_token]}
+
+    dependencies.get_jwks = lambda: minter.jwks
+    dependencies.fetch_user_attributes = lambda username: {"nickname": "Bench"}
+    cognito.refresh_access_token_async = refresh_access_token_async
+
+
+def reset_caches() -> None:
+    dependencies.verified_tokens.clear()
+    refresh_coordinator._recent.clear()
+
+
+def asgi_request(credentials: Credentials) -> Request:
+    return Request(
+        scope={
+            "type": "http",
+            "method": "GET",
+            "path": "/matches",
+            "headers": [(b"cookie", credentials.cookie_header.encode())],
+        }
+    )
+
+
+async def run_dependency(credentials: list[Credentials]) -> list[float]:
+    async def call(item: Credentials) -> None:
+        request = asgi_request(item)
+        await dependencies.get_current_user(request)
+        if item.refresh_token and not getattr(request.state, "new_access_token", None):
+            raise RuntimeError("Expired token was not refreshed")
+
+    return await timed(call, credentials)
+
+
+async def empty_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def run_over_http(asgi_app: Any, path: str, credentials: list[Credentials]) -> list[float]:
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+
+        async def call(item: Credentials) -> None:
+            # Cookies are sent explicitly; nothing from earlier responses carries over.
+            client.cookies.clear()
+            response = await client.get(path, headers={"cookie": item.cookie_header})
+            response.raise_for_status()
+            if item.refresh_token and ACCESS_TOKEN_COOKIE not in response.cookies:
+                raise RuntimeError("Expired token was not refreshed")
+
+        return await timed(call, credentials)
+
+
+async def timed(
+    call: Callable[[Credentials], Awaitable[None]], credentials: list[Credentials]
+) -> list[float]:
+    """Return per-call latencies in microseconds, skipping the warm-up calls."""
+    latencies: list[float] = []
+    for index, item in enumerate(credentials):
+        started = time.perf_counter_ns()
+        await call(item)
+        if index >= WARMUP:
+            latencies.append((time.perf_counter_ns() - started) / 1_000)
+    return latencies
+
+
+LAYERS: dict[str, Callable[[list[Credentials]], Awaitable[list[float]]]] = {
+    "get_current_user": run_dependency,
+    "middleware": lambda credentials: run_over_http(
+        RefreshTokenMiddleware(empty_app), "/", credentials
+    ),
+    "/matches": lambda credentials: run_over_http(app, "/matches", credentials),
+}
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    return {
+        "ops_per_sec": len(ordered) / (sum(ordered) / 1_000_000),
+        "p50_us": statistics.median(ordered),
+        "p95_us": percentile(0.95),
+        "p99_us": percentile(0.99),
+    }
+
+
+def check_regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], allowed: float
+) -> list[str]:
+    failures = []
+    for scenario, numbers in results.items():
+        before = baseline.get(scenario)
+        if before is None:
+            continue
+        floor = before["ops_per_sec"] * (1 - allowed)
+        if numbers["ops_per_sec"] < floor:
+            failures.append(
+                f"{scenario}: {numbers['ops_per_sec']:,.0f} ops/sec "
+                f"< {floor:,.0f} (baseline {before['ops_per_sec']:,.0f})"
+            )
+    return failures
+
+
+def parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1_000, help="Timed calls per scenario.")
+    parser.add_argument("--layers", default=",".join(LAYERS), help="Comma-separated layers.")
+    parser.add_argument("--paths", default=",".join(PATHS), help="Comma-separated token paths.")
+    parser.add_argument(
+        "--no-token-cache",
+        action="store_true",
+        help="Disable the verified-token cache to get before-caching numbers.",
+    )
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="JSON results from an earlier --save to compare with.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed ops/sec drop against --baseline, as a fraction (default 0.2).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    # httpx logs every request at INFO, which would dominate the timings; the
+    # auth modules log each expired token, which is the point of one scenario.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    set_match_repository(InMemoryMatchRepository())
+    if args.no_token_cache:
+        dependencies.verified_tokens.max_entries = 0
+
+    minter = TokenMinter()
+    results: dict[str, dict[str, float]] = {}
+    print(
+        f"{'layer':<18} {'path':<8} {'ops/sec':>10} {'p50 µs':>10} {'p95 µs':>10} {'p99 µs':>10}"
+    )
+    for layer in args.layers.split(","):
+        for path in args.paths.split(","):
+            credentials = minter.credentials(path, WARMUP + args.requests)
+            install_stubs(minter, credentials)
+            reset_caches()
+            summary = summarize(asyncio.run(LAYERS[layer](credentials)))
+            results[f"{layer}/{path}"] = summary
+            print(
+                f"{layer:<18} {path:<8} {summary['ops_per_sec']:>10,.0f} "
+                f"{summary['p50_us']:>10,.1f} {summary['p95_us']:>10,.1f} "
+                f"{summary['p99_us']:>10,.1f}"
+            )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        failures = check_regressions(results, baseline, args.max_regression)
+        if failures:
+            print("Regressions beyond the allowed threshold:", file=sys.stderr)
+            for failure in failures:
+                print(f"  {failure}", file=sys.stderr)
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
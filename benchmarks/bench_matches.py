@@ -0,0 +1,148 @@
+"""Throughput and latency of the match repositories at different table sizes.
+
+Runs offline: the DynamoDB repository talks to ``FakeDynamoDBTable``, so the
+numbers cover the repository's own work (item building, key conditions,
+shard merging, paging) but not network round trips.
+
+    python -m benchmarks.bench_matches
+    python -m benchmarks.bench_matches --sizes 1000,100000 --backends memory
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import statistics
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+
+from app.services.matches import (
+    CLASS_OPTIONS,
+    DynamoDBMatchRepository,
+    InMemoryMatchRepository,
+    Match,
+    MatchRepository,
+    encode_cursor,
+)
+from tests.fake_dynamodb import FakeDynamoDBTable
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+PAGE_SIZE = 20
+CREATORS = 100
+SEED_CHUNK = 1_000
+EPOCH = datetime(2030, 1, 1, 9, 0)
+
+BACKENDS: dict[str, Callable[[int], MatchRepository]] = {
+    "memory": lambda shards: InMemoryMatchRepository(),
+    "dynamodb-fake": lambda shards: DynamoDBMatchRepository(
+        FakeDynamoDBTable(), shard_count=shards
+    ),
+}
+
+
+def random_match(rng: random.Random, size: int) -> Match:
+    first_class = rng.randrange(len(CLASS_OPTIONS))
+    return Match(
+        id="",
+        creator_sub=f"user-{rng.randrange(CREATORS)}",
+        title=f"Match {rng.randrange(size * 10)}",
+        starts_at=EPOCH + timedelta(minutes=rng.randrange(size * 10)),
+        location="Park pitch",
+        class_from=CLASS_OPTIONS[first_class],
+        class_to=CLASS_OPTIONS[rng.randrange(first_class, len(CLASS_OPTIONS))],
+        max_players=rng.randrange(6, 23),
+        notes="Bring water" if rng.random() < 0.5 else "",
+    )
+
+
+def seed(repository: MatchRepository, size: int, rng: random.Random) -> list[str]:
+    """Insert ``size`` matches and return their sort keys."""
+    sort_keys: list[str] = []
+    for start in range(0, size, SEED_CHUNK):
+        chunk = [random_match(rng, size) for _ in range(min(SEED_CHUNK, size - start))]
+        sort_keys.extend(match.sort_key for match in repository.create_many(chunk).created)
+    return sort_keys
+
+
+def measure(operation: Callable[[], object], count: int) -> list[float]:
+    """Return per-call latencies in microseconds."""
+    latencies: list[float] = []
+    for _ in range(count):
+        started = time.perf_counter_ns()
+        operation()
+        latencies.append((time.perf_counter_ns() - started) / 1_000)
+    return latencies
+
+
+def report(backend: str, size: int, name: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    ops_per_second = len(ordered) / (sum(ordered) / 1_000_000)
+    print(
+        f"{backend:<14} {size:>9,} {name:<22} "
+        f"{ops_per_second:>11,.0f} {p50:>10,.1f} {p99:>10,.1f}"
+    )
+
+
+def run(backend: str, size: int, operations: int, shards: int) -> None:
+    rng = random.Random(size)
+    repository = BACKENDS[backend](shards)
+    seeded_at = time.perf_counter()
+    sort_keys = seed(repository, size, rng)
+    print(f"# {backend}: seeded {size:,} matches in {time.perf_counter() - seeded_at:.1f}s")
+
+    results = {
+        "create": measure(lambda: repository.create(random_match(rng, size)), operations),
+        "list_page first": measure(lambda: repository.list_page(PAGE_SIZE), operations),
+        "list_page cursor": measure(
+            lambda: repository.list_page(
+                PAGE_SIZE, encode_cursor("after", rng.choice(sort_keys))
+            ),
+            operations,
+        ),
+        "list_by_creator": measure(
+            lambda: repository.list_by_creator(f"user-{rng.randrange(CREATORS)}", PAGE_SIZE),
+            operations,
+        ),
+    }
+    for name, latencies in results.items():
+        report(backend, size, name, latencies)
+
+
+def parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated numbers of seeded matches.",
+    )
+    parser.add_argument(
+        "--backends",
+        default=",".join(BACKENDS),
+        help=f"Comma-separated repositories to run: {', '.join(BACKENDS)}.",
+    )
+    parser.add_argument(
+        "--operations", type=int, default=1_000, help="Timed calls per operation."
+    )
+    parser.add_argument(
+        "--shards", type=int, default=4, help="MATCHES_SHARD_COUNT for the DynamoDB backend."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    print(f"{'backend':<14} {'size':>9} {'operation':<22} {'ops/sec':>11} "
+          f"{'p50 µs':>10} {'p99 µs':>10}")
+    for backend in args.backends.split(","):
+        for size in (int(value) for value in args.sizes.split(",")):
+            run(backend, size, args.operations, args.shards)
+            # Free the previous table before seeding the next one.
+            gc.collect()
+
+
+if __name__ == "__main__":
+    main()
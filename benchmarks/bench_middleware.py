@@ -0,0 +1,99 @@
+"""Requests/sec through the ASGI app with and without RefreshTokenMiddleware.
+
+Drives the app in-process over httpx's ASGI transport, so the numbers cover
+routing, middleware and rendering but not sockets. Requests carry an access
+cookie with a future ``exp`` so the middleware does its full cookie check
+without calling Cognito.
+
+    LOCAL_AUTH_ENABLED=true python -m benchmarks.bench_middleware
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Sequence
+
+import httpx
+from fastapi import FastAPI
+from jose import jwt
+
+from app.auth.cookies import ACCESS_TOKEN_COOKIE
+from app.auth.middleware import RefreshTokenMiddleware
+from app.main import app
+from app.services.matches import InMemoryMatchRepository, set_match_repository
+
+PATHS = {
+    "static": "/static/css/tailwind.css",
+    "page": "/matches",
+}
+
+
+def app_without_middleware() -> FastAPI:
+    """Same routes and mounts as ``app.main.app``, minus user middleware."""
+    bare = FastAPI()
+    bare.router.routes.extend(app.router.routes)
+    return bare
+
+
+def app_with_middleware() -> FastAPI:
+    wrapped = app_without_middleware()
+    wrapped.add_middleware(RefreshTokenMiddleware)
+    return wrapped
+
+
+async def measure(asgi_app: FastAPI, path: str, requests: int) -> list[float]:
+    """Return per-request latencies in microseconds."""
+    cookie = jwt.encode({"exp": int(time.time()) + 3600}, "bench", algorithm="HS256")
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://testserver",
+        cookies={ACCESS_TOKEN_COOKIE: cookie},
+    ) as client:
+        # Warm up routing, template compilation and static file stats.
+        for _ in range(20):
+            (await client.get(path)).raise_for_status()
+        latencies: list[float] = []
+        for _ in range(requests):
+            started = time.perf_counter_ns()
+            response = await client.get(path)
+            latencies.append((time.perf_counter_ns() - started) / 1_000)
+            response.raise_for_status()
+    return latencies
+
+
+def report(variant: str, route: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    requests_per_second = len(ordered) / (sum(ordered) / 1_000_000)
+    print(f"{variant:<20} {route:<8} {requests_per_second:>10,.0f} {p50:>10,.1f} {p99:>10,.1f}")
+
+
+def parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000, help="Timed requests per route.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    # httpx logs every request at INFO, which would dominate the timings.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    set_match_repository(InMemoryMatchRepository())
+    variants = {
+        "without middleware": app_without_middleware(),
+        "with middleware": app_with_middleware(),
+    }
+    print(f"{'variant':<20} {'route':<8} {'req/sec':>10} {'p50 µs':>10} {'p99 µs':>10}")
+    for route, path in PATHS.items():
+        for variant, asgi_app in variants.items():
+            report(variant, route, asyncio.run(measure(asgi_app, path, args.requests)))
+
+
+if __name__ == "__main__":
+    main()
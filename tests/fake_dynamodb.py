@@ -0,0 +1,371 @@
+"""In-process stand-in for a boto3 DynamoDB ``Table`` resource.
+
+Implements the subset of the Table API the match repository uses, with
+DynamoDB's paging semantics, so ``DynamoDBMatchRepository`` can be exercised
+and benchmarked without AWS:
+
+- ``query`` with ``Key`` conditions (``eq`` on the partition key and ``eq``,
+  ``between``, ``begins_with``, ``lt``/``lte``/``gt``/``gte`` on the sort
+  key), ``ScanIndexForward``, ``Limit``, ``ExclusiveStartKey``, 1 MB response
+  pages, global secondary indexes and ``ProjectionExpression``
+- ``put_item``, ``delete_item`` and ``batch_writer``
+- ``meta.client.batch_write_item`` with serialized attribute values
+
+An ``ExclusiveStartKey`` outside the key condition is rejected with a
+``ValidationException``, as DynamoDB does. ``max_page_items`` and
+``unprocessed_batches`` make short pages and ``UnprocessedItems`` easy to
+provoke in tests; ``queries`` and ``batch_writes`` count the calls made.
+
+Each partition keeps its sort keys in a sorted list, so reads cost a binary
+search plus the page, as they do in DynamoDB.
+"""
+
+from __future__ import annotations
+
+import bisect
+from decimal import Decimal
+from threading import RLock
+from types import SimpleNamespace
+from typing import Any
+
+from boto3.dynamodb.conditions import ConditionBase
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+# DynamoDB stops reading a query page once this much data has been read.
+MAX_RESPONSE_BYTES = 1024 * 1024
+BATCH_WRITE_LIMIT = 25
+
+_deserializer = TypeDeserializer()
+
+# (sort value, PK, SK): base-table SK values are unique per partition, GSI
+# sort values are not, so the base key breaks ties as it does in DynamoDB.
+_IndexEntry = tuple[str, str, str]
+# A sort key bound and whether it is inclusive.
+_Bound = tuple[str, bool]
+
+
+def _sort_value(entry: _IndexEntry) -> str:
+    return entry[0]
+
+
+def _validation_error(message: str, operation: str) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ValidationException", "Message": message}}, operation
+    )
+
+
+def _within(value: str, low: _Bound | None, high: _Bound | None) -> bool:
+    if low is not None and (value < low[0] or (value == low[0] and not low[1])):
+        return False
+    if high is not None and (value > high[0] or (value == high[0] and not high[1])):
+        return False
+    return True
+
+
+def _to_stored(value: Any) -> Any:
+    """Normalise a Python value the way boto3 round-trips it."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, dict):
+        return {key: _to_stored(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_to_stored(item) for item in value]
+    return value
+
+
+def _item_size(item: dict[str, Any]) -> int:
+    """Approximate DynamoDB item size: attribute names plus encoded values."""
+    size = 0
+    for name, value in item.items():
+        size += len(name.encode())
+        if isinstance(value, str):
+            size += len(value.encode())
+        elif isinstance(value, Decimal):
+            size += len(str(value)) // 2 + 1
+        else:
+            size += len(str(value).encode())
+    return size
+
+
+class _BatchWriter:
+    def __init__(self, table: FakeDynamoDBTable) -> None:
+        self._table = table
+
+    def __enter__(self) -> _BatchWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+    def put_item(self, Item: dict[str, Any]) -> None:
+        self._table.put_item(Item=Item)
+
+    def delete_item(self, Key: dict[str, Any]) -> None:
+        self._table.delete_item(Key=Key)
+
+
+class _FakeClient:
+    def __init__(self, table: FakeDynamoDBTable) -> None:
+        self._table = table
+
+    def batch_write_item(self, RequestItems: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+        self._table.batch_writes += 1
+        requests = RequestItems.get(self._table.name)
+        if requests is None or len(RequestItems) != 1:
+            raise _validation_error(
+                f"Requested resource not found: {sorted(RequestItems)}", "BatchWriteItem"
+            )
+        if not requests or len(requests) > BATCH_WRITE_LIMIT:
+            raise _validation_error(
+                f"Batch must contain between 1 and {BATCH_WRITE_LIMIT} requests",
+                "BatchWriteItem",
+            )
+        unprocessed: list[dict[str, Any]] = []
+        if self._table.unprocessed_batches:
+            # Throttled: only the first request lands this time.
+            self._table.unprocessed_batches -= 1
+            requests, unprocessed = requests[:1], requests[1:]
+        for request in requests:
+            if "PutRequest" in request:
+                serialized = request["PutRequest"]["Item"]
+                self._table.put_item(
+                    Item={key: _deserializer.deserialize(value) for key, value in serialized.items()}
+                )
+            else:
+                serialized = request["DeleteRequest"]["Key"]
+                self._table.delete_item(
+                    Key={key: _deserializer.deserialize(value) for key, value in serialized.items()}
+                )
+        return {"UnprocessedItems": {self._table.name: unprocessed} if unprocessed else {}}
+
+
+class FakeDynamoDBTable:
+    """Single-process DynamoDB table with string partition and sort keys.
+
+    ``global_secondary_indexes`` maps index names to their
+    ``(partition key, sort key)`` attribute names; indexes project all
+    attributes. Items missing an index's key attributes are not indexed, as
+    in DynamoDB. ``max_page_items`` ends each query page after that many
+    items, as the 1 MB limit would for larger items; ``unprocessed_batches``
+    is the number of ``batch_write_item`` calls that only write their first
+    request and return the rest as ``UnprocessedItems``.
+    """
+
+    def __init__(
+        self,
+        name: str = "matches",
+        *,
+        partition_key: str = "PK",
+        sort_key: str = "SK",
+        global_secondary_indexes: dict[str, tuple[str, str]] | None = None,
+        max_page_items: int | None = None,
+        unprocessed_batches: int = 0,
+    ) -> None:
+        self.name = name
+        self.max_page_items = max_page_items
+        self.unprocessed_batches = unprocessed_batches
+        self.queries = 0
+        self.batch_writes = 0
+        self.key_schema = (partition_key, sort_key)
+        if global_secondary_indexes is None:
+            global_secondary_indexes = {"GSI1": ("GSI1PK", "GSI1SK")}
+        self.index_schemas: dict[str | None, tuple[str, str]] = {
+            None: self.key_schema,
+            **global_secondary_indexes,
+        }
+        self.meta = SimpleNamespace(client=_FakeClient(self))
+        self._lock = RLock()
+        self._items: dict[tuple[str, str], dict[str, Any]] = {}
+        self._indexes: dict[str | None, dict[str, list[_IndexEntry]]] = {
+            index_name: {} for index_name in self.index_schemas
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def stored_items(self) -> list[dict[str, Any]]:
+        """Copies of every item, ordered by primary key."""
+        with self._lock:
+            return [dict(self._items[key]) for key in sorted(self._items)]
+
+    def put_item(self, Item: dict[str, Any]) -> dict[str, Any]:
+        item = {key: _to_stored(value) for key, value in Item.items()}
+        key = self._key_of(item, "PutItem")
+        with self._lock:
+            previous = self._items.get(key)
+            if previous is not None:
+                self._unindex(previous, key)
+            self._items[key] = item
+            for index_name, (hash_attr, range_attr) in self.index_schemas.items():
+                if hash_attr in item and range_attr in item:
+                    bisect.insort(
+                        self._indexes[index_name].setdefault(item[hash_attr], []),
+                        (item[range_attr], *key),
+                    )
+        return {}
+
+    def delete_item(self, Key: dict[str, Any]) -> dict[str, Any]:
+        key = self._key_of(Key, "DeleteItem")
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self._unindex(previous, key)
+        return {}
+
+    def batch_writer(self) -> _BatchWriter:
+        return _BatchWriter(self)
+
+    def query(
+        self,
+        KeyConditionExpression: ConditionBase,
+        IndexName: str | None = None,
+        ScanIndexForward: bool = True,
+        Limit: int | None = None,
+        ExclusiveStartKey: dict[str, Any] | None = None,
+        ProjectionExpression: str | None = None,
+        ExpressionAttributeNames: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        if IndexName not in self.index_schemas:
+            raise _validation_error(f"The table does not have the index {IndexName}", "Query")
+        if Limit is not None and Limit < 1:
+            raise _validation_error("Limit must be at least 1", "Query")
+        self.queries += 1
+        hash_attr, range_attr = self.index_schemas[IndexName]
+        partition, low, high = self._key_range(KeyConditionExpression, hash_attr, range_attr)
+
+        with self._lock:
+            entries = self._indexes[IndexName].get(partition, [])
+            start, stop = 0, len(entries)
+            if low is not None:
+                find = bisect.bisect_left if low[1] else bisect.bisect_right
+                start = find(entries, low[0], key=_sort_value)
+            if high is not None:
+                find = bisect.bisect_right if high[1] else bisect.bisect_left
+                stop = find(entries, high[0], key=_sort_value)
+            if ExclusiveStartKey is not None:
+                position = (
+                    ExclusiveStartKey[range_attr],
+                    *self._key_of(ExclusiveStartKey, "Query"),
+                )
+                if not _within(position[0], low, high):
+                    raise _validation_error(
+                        "The provided starting key is outside query boundaries based on "
+                        "provided conditions",
+                        "Query",
+                    )
+                if ScanIndexForward:
+                    start = bisect.bisect_right(entries, position)
+                else:
+                    stop = bisect.bisect_left(entries, position)
+            positions = range(start, stop) if ScanIndexForward else range(stop - 1, start - 1, -1)
+
+            items: list[dict[str, Any]] = []
+            read_bytes = 0
+            last_entry: _IndexEntry | None = None
+            for offset in positions:
+                entry = entries[offset]
+                item = self._items[entry[1:]]
+                read_bytes += _item_size(item)
+                if items and read_bytes > MAX_RESPONSE_BYTES:
+                    break
+                items.append(item)
+                last_entry = entry
+                if Limit is not None and len(items) >= Limit:
+                    break
+                if self.max_page_items is not None and len(items) >= self.max_page_items:
+                    break
+            else:
+                last_entry = None
+
+        response: dict[str, Any] = {
+            "Items": self._project(items, ProjectionExpression, ExpressionAttributeNames),
+            "Count": len(items),
+            "ScannedCount": len(items),
+        }
+        if last_entry is not None:
+            last_item = self._items.get(last_entry[1:], {})
+            key_attrs = {*self.key_schema, hash_attr, range_attr}
+            response["LastEvaluatedKey"] = {
+                attr: last_item[attr] for attr in key_attrs if attr in last_item
+            }
+        return response
+
+    def _key_of(self, item: dict[str, Any], operation: str) -> tuple[str, str]:
+        partition_key, sort_key = self.key_schema
+        try:
+            return item[partition_key], item[sort_key]
+        except KeyError as exc:
+            raise _validation_error(
+                f"Missing the key {exc.args[0]} in the item", operation
+            ) from exc
+
+    def _unindex(self, item: dict[str, Any], key: tuple[str, str]) -> None:
+        for index_name, (hash_attr, range_attr) in self.index_schemas.items():
+            if hash_attr not in item or range_attr not in item:
+                continue
+            entries = self._indexes[index_name][item[hash_attr]]
+            del entries[bisect.bisect_left(entries, (item[range_attr], *key))]
+            if not entries:
+                del self._indexes[index_name][item[hash_attr]]
+
+    @staticmethod
+    def _key_range(
+        condition: ConditionBase, hash_attr: str, range_attr: str
+    ) -> tuple[str, _Bound | None, _Bound | None]:
+        """Split a key condition into the partition value and sort key bounds."""
+        expression = condition.get_expression()
+        clauses = (
+            [clause.get_expression() for clause in expression["values"]]
+            if expression["operator"] == "AND"
+            else [expression]
+        )
+        partition: str | None = None
+        low: _Bound | None = None
+        high: _Bound | None = None
+        for clause in clauses:
+            operator = clause["operator"]
+            name = clause["values"][0].name
+            operands = clause["values"][1:]
+            if name == hash_attr and operator == "=":
+                partition = operands[0]
+            elif name != range_attr:
+                raise _validation_error(f"Query key condition not supported: {name}", "Query")
+            elif operator == "=":
+                low = high = (operands[0], True)
+            elif operator == "BETWEEN":
+                low, high = (operands[0], True), (operands[1], True)
+            elif operator == "begins_with":
+                prefix = operands[0]
+                low = (prefix, True)
+                if prefix:
+                    high = (prefix[:-1] + chr(ord(prefix[-1]) + 1), False)
+            elif operator in (">", ">="):
+                low = (operands[0], operator == ">=")
+            elif operator in ("<", "<="):
+                high = (operands[0], operator == "<=")
+            else:
+                raise _validation_error(f"Unsupported key condition {operator}", "Query")
+        if partition is None:
+            raise _validation_error(
+                f"Query condition missed key schema element: {hash_attr}", "Query"
+            )
+        return partition, low, high
+
+    @staticmethod
+    def _project(
+        items: list[dict[str, Any]],
+        projection: str | None,
+        names: dict[str, str] | None,
+    ) -> list[dict[str, Any]]:
+        if projection is None:
+            return [dict(item) for item in items]
+        names = names or {}
+        attrs = [names.get(part.strip(), part.strip()) for part in projection.split(",")]
+        return [{attr: item[attr] for attr in attrs if attr in item} for item in items]
+
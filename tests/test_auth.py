@@ -1,8 +1,13 @@
+import asyncio
 import os
 import sys
+import threading
+import time
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
-from fastapi.security import HTTPAuthorizationCredentials
+import httpx
 from jose import jwt
+from jose.exceptions import ExpiredSignatureError
 import base64
 import importlib
 import pytest
@@ -23,6 +28,20 @@ from app.config import COGNITO_AUTH_URL  # noqa: E402
 client = TestClient(app)
 
 
+async def fake_current_user(request=None, token=None):
+    return {
+        "sub": "u1",
+        "username": "u1",
+        "attributes": {"nickname": "nick"},
+    }
+
+
+def _bearer_request(token):
+    return Request(
+        scope={"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]}
+    )
+
+
 def test_login_redirect():
     resp = client.get("/auth/login", follow_redirects=False)
     assert resp.status_code == 307
@@ -30,14 +49,7 @@ def test_login_redirect():
 
 
 def test_homepage_get(monkeypatch):
-    monkeypatch.setattr(
-        "app.auth.dependencies.get_current_user",
-        lambda token=None: {
-            "sub": "u1",
-            "username": "u1",
-            "attributes": {"nickname": "nick"},
-        },
-    )
+    monkeypatch.setattr("app.auth.dependencies.get_current_user", fake_current_user)
     response = client.get("/", headers={"Authorization": "Bearer token"})
     assert response.status_code == 200
     assert "Hello" in response.text
@@ -52,14 +64,7 @@ def test_homepage_redirect_for_new_user():
 
 
 def test_homepage_cookie_login(monkeypatch):
-    monkeypatch.setattr(
-        "app.auth.dependencies.get_current_user",
-        lambda token=None: {
-            "sub": "u1",
-            "username": "u1",
-            "attributes": {"nickname": "nick"},
-        },
-    )
+    monkeypatch.setattr("app.auth.dependencies.get_current_user", fake_current_user)
 
     client.cookies.set("access_token", "abc")
     response = client.get("/")
@@ -69,29 +74,17 @@ def test_homepage_cookie_login(monkeypatch):
 
 
 def test_callback_flow(monkeypatch):
-    def fake_post(url, data=None, auth=None, headers=None, **kwargs):
-        class Resp:
-            status_code = 200
-            headers = {}
-            text = "{}"
+    token_requests = []
 
-            def raise_for_status(self):
-                pass
+    def token_endpoint(request):
+        token_requests.append(request)
+        return httpx.Response(200, json={"id_token": "jwt1"})
 
-            def json(self):
-                return {"id_token": "jwt1"}
-
-        return Resp()
-
-    monkeypatch.setattr("app.auth.cognito.requests.post", fake_post)
     monkeypatch.setattr(
-        "app.auth.dependencies.get_current_user",
-        lambda token=None: {
-            "sub": "u1",
-            "username": "u1",
-            "attributes": {"nickname": "nick"},
-        },
+        "app.auth.cognito.http_client.async_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(token_endpoint)),
     )
+    monkeypatch.setattr("app.auth.dependencies.get_current_user", fake_current_user)
 
     resp = client.get("/?code=abc", follow_redirects=False)
     assert resp.status_code == 303
@@ -108,6 +101,10 @@ def test_callback_flow(monkeypatch):
     resp2 = client.get("/")
     assert resp2.status_code == 200
     assert "u1" in resp2.text
+    assert [str(request.url) for request in token_requests] == [
+        "https://example.com/oauth2/token"
+    ]
+    assert b"grant_type=authorization_code" in token_requests[0].content
 
 
 def test_logout_clears_auth_cookies():
@@ -149,17 +146,16 @@ def test_get_current_user_valid(monkeypatch):
         headers={"kid": "test"},
     )
 
-    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
     request = Request(
         scope={
             "type": "http",
             "scheme": "http",
             "server": ("testserver", 80),
             "path": "/",
-            "headers": [],
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
         }
     )
-    payload = dependencies.get_current_user(request=request, token=creds)
+    payload = asyncio.run(dependencies.get_current_user(request))
     assert payload["sub"] == "u1"
 
 
@@ -184,10 +180,8 @@ def test_get_current_user_invalid(monkeypatch):
     token = jwt.encode({"sub": "u1", "aud": os.environ["COGNITO_APP_CLIENT_ID"]},
                        "wrong", algorithm="HS256", headers={"kid": "test"})
 
-    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-    request = Request(scope={"type": "http", "headers": []})
     with pytest.raises(Exception):
-        dependencies.get_current_user(request=request, token=creds)
+        asyncio.run(dependencies.get_current_user(_bearer_request(token)))
 
 
 def test_secure_cookies_enabled_outside_local(monkeypatch):
@@ -214,3 +208,432 @@ def test_secure_cookies_enabled_for_forwarded_https(monkeypatch):
     )
 
     assert auth_cookies.use_secure_cookies(request)
+
+
+def test_get_current_user_caches_verified_token_until_exp(monkeypatch):
+    secret = "secret"
+    jwks = {
+        "keys": [
+            {
+                "kty": "oct",
+                "kid": "test",
+                "k": base64.urlsafe_b64encode(secret.encode()).decode().rstrip("="),
+                "alg": "HS256",
+            }
+        ]
+    }
+
+    monkeypatch.setattr("app.auth.cognito.fetch_user_attributes", lambda sub: {})
+    sys.modules.pop("app.auth.dependencies", None)
+    dependencies = importlib.import_module("app.auth.dependencies")
+    monkeypatch.setattr(dependencies, "get_jwks", lambda: jwks)
+    exp = int(time.time()) + 300
+    token = jwt.encode(
+        {"sub": "u1", "username": "u1", "aud": os.environ["COGNITO_APP_CLIENT_ID"], "exp": exp},
+        secret,
+        algorithm="HS256",
+        headers={"kid": "test"},
+    )
+    first = asyncio.run(dependencies.get_current_user(_bearer_request(token)))
+    decode_calls = []
+    real_decode = dependencies.jwt.decode
+    monkeypatch.setattr(
+        dependencies.jwt,
+        "decode",
+        lambda *args, **kwargs: decode_calls.append(args) or real_decode(*args, **kwargs),
+    )
+    second = asyncio.run(dependencies.get_current_user(_bearer_request(token)))
+
+    assert second == first
+    assert decode_calls == []
+    assert dependencies.verified_tokens.stats()["hits"] == 1
+
+    # Once exp has passed the cached entry is dropped and the token is re-verified.
+    def expired_decode(*args, **kwargs):
+        decode_calls.append(args)
+        raise ExpiredSignatureError("Signature has expired.")
+
+    monkeypatch.setattr(dependencies.verified_tokens, "clock", lambda: exp + 1)
+    monkeypatch.setattr(dependencies.jwt, "decode", expired_decode)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(dependencies.get_current_user(_bearer_request(token)))
+    assert exc_info.value.detail == "Token expired"
+    assert len(decode_calls) == 1
+
+
+def _oct_jwk(kid, secret="secret"):
+    return {
+        "kty": "oct",
+        "kid": kid,
+        "k": base64.urlsafe_b64encode(secret.encode()).decode().rstrip("="),
+        "alg": "HS256",
+    }
+
+
+def test_jwks_store_refetches_once_for_rotated_kid():
+    from app.auth.jwks import JWKSKeyStore
+
+    now = [0.0]
+    documents = [{"keys": [_oct_jwk("old")]}, {"keys": [_oct_jwk("old"), _oct_jwk("new")]}]
+    fetches = []
+
+    def fetch():
+        fetches.append(now[0])
+        return documents[min(len(fetches), len(documents)) - 1]
+
+    store = JWKSKeyStore(fetch, ttl_seconds=3600, min_refetch_seconds=30, clock=lambda: now[0])
+
+    assert store.get("old")[1] == "HS256"
+    assert store.get("new") is None  # Within the refetch window: no second fetch.
+    now[0] = 31
+    assert store.get("new") is not None
+    assert store.get("bogus") is None
+    assert fetches == [0.0, 31]
+    assert store.stats()["refetches_throttled"] == 2
+
+
+def test_jwks_store_shares_one_fetch_between_concurrent_callers():
+    from app.auth.jwks import JWKSKeyStore
+
+    release = threading.Event()
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        release.wait(timeout=5)
+        return {"keys": [_oct_jwk("k1")]}
+
+    store = JWKSKeyStore(fetch, ttl_seconds=3600, min_refetch_seconds=30)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get("k1"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(fetches) == 1
+    assert len(results) == 5 and all(results)
+
+
+def test_jwks_store_refreshes_stale_keys_in_background():
+    from app.auth.jwks import JWKSKeyStore
+
+    now = [0.0]
+    refreshed = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(now[0])
+        if len(calls) > 1:
+            refreshed.set()
+        return {"keys": [_oct_jwk("k1")]}
+
+    store = JWKSKeyStore(fetch, ttl_seconds=60, min_refetch_seconds=30, clock=lambda: now[0])
+    store.get("k1")
+    now[0] = 61
+
+    assert store.get("k1") is not None  # Served immediately from the stale index.
+    assert refreshed.wait(timeout=5)
+    assert calls == [0.0, 61]
+
+
+def test_fetch_user_attributes_caches_hits_and_failures(monkeypatch):
+    from botocore.exceptions import ClientError
+
+    import app.auth.cognito as cognito
+
+    calls = []
+
+    class FakeCognito:
+        def admin_get_user(self, UserPoolId, Username):
+            calls.append(Username)
+            if Username == "missing":
+                raise ClientError({"Error": {"Code": "UserNotFoundException"}}, "AdminGetUser")
+            return {"UserAttributes": [{"Name": "nickname", "Value": "nick"}]}
+
+    monkeypatch.setattr(cognito, "get_cognito_client", lambda: FakeCognito())
+    monkeypatch.setattr(cognito, "user_attributes_cache", cognito.TTLCache(8, 300))
+
+    first = cognito.fetch_user_attributes("u1")
+    first["nickname"] = "changed by caller"
+    assert cognito.fetch_user_attributes("u1") == {"nickname": "nick"}
+    assert cognito.fetch_user_attributes("missing") == {}
+    assert cognito.fetch_user_attributes("missing") == {}
+    cognito.invalidate_user_attributes("u1")
+    cognito.fetch_user_attributes("u1")
+
+    assert calls == ["u1", "missing", "u1"]
+    assert cognito.user_attributes_cache.stats()["hits"] == 2
+
+
+def test_refresh_coordinator_shares_one_refresh_between_callers():
+    from app.auth.refresh import TokenRefreshCoordinator
+
+    calls = []
+
+    async def refresh(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.01)
+        return {"access_token": f"new-{len(calls)}"}
+
+    coordinator = TokenRefreshCoordinator(refresh, reuse_seconds=30)
+
+    async def scenario():
+        results = await asyncio.gather(*(coordinator.refresh("r1") for _ in range(4)))
+        return results, await coordinator.refresh("r1")
+
+    results, reused = asyncio.run(scenario())
+
+    assert calls == ["r1"]
+    assert results == [{"access_token": "new-1"}] * 4
+    assert reused == {"access_token": "new-1"}
+    assert coordinator.stats() == {"refreshes": 1, "shared": 4, "in_flight": 0}
+
+
+def test_expired_cookie_is_refreshed_once_per_request(monkeypatch):
+    import app.main as main_module
+
+    secret = "secret"
+    dependencies = main_module.auth_dependencies
+    monkeypatch.setattr(dependencies, "get_jwks", lambda: {"keys": [_oct_jwk("test", secret)]})
+    monkeypatch.setattr(dependencies, "jwks_store", dependencies.JWKSKeyStore(
+        lambda: dependencies.get_jwks(), ttl_seconds=3600, min_refetch_seconds=30
+    ))
+    monkeypatch.setattr(dependencies, "fetch_user_attributes", lambda username: {})
+
+    def make_token(exp):
+        return jwt.encode(
+            {"sub": "u1", "username": "u1", "aud": os.environ["COGNITO_APP_CLIENT_ID"],
+             "exp": exp},
+            secret,
+            algorithm="HS256",
+            headers={"kid": "test"},
+        )
+
+    fresh_token = make_token(int(time.time()) + 300)
+    refreshes = []
+
+    async def fake_refresh(refresh_token):
+        refreshes.append(refresh_token)
+        return {"access_token": fresh_token}
+
+    monkeypatch.setattr("app.auth.cognito.refresh_access_token_async", fake_refresh)
+
+    client.cookies.set("access_token", make_token(int(time.time()) - 10))
+    client.cookies.set("refresh_token", "refresh-once")
+    response = client.get("/")
+    client.cookies.clear()
+
+    assert response.status_code == 200
+    assert "u1" in response.text
+    assert refreshes == ["refresh-once"]
+    assert response.cookies.get("access_token") == fresh_token
+
+
+def test_refresh_middleware_skips_static_paths(monkeypatch):
+    refreshes = []
+
+    async def fake_refresh(refresh_token):
+        refreshes.append(refresh_token)
+        return {"access_token": "new"}
+
+    monkeypatch.setattr("app.auth.cognito.refresh_access_token_async", fake_refresh)
+    expired = jwt.encode({"exp": int(time.time()) - 10}, "secret", algorithm="HS256")
+
+    client.cookies.set("access_token", expired)
+    client.cookies.set("refresh_token", "refresh-static")
+    response = client.get("/static/css/tailwind.css")
+    client.cookies.clear()
+
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+    assert refreshes == []
+
+
+def test_auth_context_verifies_once_per_request(monkeypatch):
+    from app.auth.context import get_auth_context
+
+    import app.main as main_module
+
+    dependencies = main_module.auth_dependencies
+    verifications = []
+
+    async def fake_authenticate(request, credentials):
+        verifications.append(credentials)
+        return {"sub": "u1", "username": "u1", "attributes": {}}
+
+    monkeypatch.setattr(dependencies, "_authenticate", fake_authenticate)
+    request = _bearer_request("header-token")
+
+    async def scenario():
+        first = await dependencies.get_current_user(request)
+        second = await dependencies.get_current_user(request)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first is second
+    assert verifications == ["header-token"]
+    assert get_auth_context(request).from_cookie is False
+
+
+def test_id_token_claims_replace_admin_get_user(monkeypatch):
+    fetched = []
+
+    def fake_fetch(username):
+        fetched.append(username)
+        return {"email": "cognito@example.com", "nickname": "from-cognito"}
+
+    monkeypatch.setattr("app.auth.cognito.fetch_user_attributes", fake_fetch)
+    sys.modules.pop("app.auth.dependencies", None)
+    dependencies = importlib.import_module("app.auth.dependencies")
+    monkeypatch.setattr(dependencies, "get_jwks", lambda: {"keys": [_oct_jwk("test")]})
+    monkeypatch.setattr(dependencies, "AUTH_USE_ID_TOKEN_CLAIMS", True)
+
+    audience = os.environ["COGNITO_APP_CLIENT_ID"]
+    exp = int(time.time()) + 300
+    access_token = jwt.encode(
+        {"sub": "u1", "username": "u1", "aud": audience, "exp": exp},
+        "secret",
+        algorithm="HS256",
+        headers={"kid": "test"},
+    )
+
+    def user_for(id_claims):
+        id_token = jwt.encode(
+            {"sub": "u1", "aud": audience, "exp": exp, "token_use": "id", **id_claims},
+            "secret",
+            algorithm="HS256",
+            headers={"kid": "test"},
+            access_token=access_token,
+        )
+        request = Request(
+            scope={
+                "type": "http",
+                "headers": [
+                    (b"authorization", f"Bearer {access_token}".encode()),
+                    (b"cookie", f"id_token={id_token}".encode()),
+                ],
+            }
+        )
+        return asyncio.run(dependencies.get_current_user(request))
+
+    user = user_for({"email": "u1@example.com", "nickname": "nick", "email_verified": True})
+    assert user["attributes"] == {
+        "sub": "u1",
+        "email": "u1@example.com",
+        "nickname": "nick",
+        "email_verified": "true",
+    }
+    assert fetched == []
+
+    # A token without the nickname claim falls back to Cognito for the gap only.
+    user = user_for({"email": "u1@example.com"})
+    assert user["attributes"]["nickname"] == "from-cognito"
+    assert user["attributes"]["email"] == "u1@example.com"
+    assert fetched == ["u1"]
+
+
+def test_saturated_pool_is_a_503_not_a_login_redirect(monkeypatch):
+    import app.main as main_module
+
+    dependencies = main_module.auth_dependencies
+    monkeypatch.setattr(dependencies, "get_jwks", lambda: {"keys": [_oct_jwk("test")]})
+    monkeypatch.setattr(dependencies, "jwks_store", dependencies.JWKSKeyStore(
+        lambda: dependencies.get_jwks(), ttl_seconds=3600, min_refetch_seconds=30
+    ))
+    dependencies.jwks_store.get("test")
+
+    async def saturated(func, *args, **kwargs):
+        raise dependencies.BlockingPoolSaturatedError("Blocking I/O pool is saturated")
+
+    monkeypatch.setattr(dependencies, "run_blocking", saturated)
+    token = jwt.encode(
+        {"sub": "u1", "username": "u1", "aud": os.environ["COGNITO_APP_CLIENT_ID"],
+         "exp": int(time.time()) + 300},
+        "secret",
+        algorithm="HS256",
+        headers={"kid": "test"},
+    )
+
+    response = client.get("/", headers={"Authorization": f"Bearer {token}"},
+                          follow_redirects=False)
+
+    assert response.status_code == 503
+
+
+def test_cached_id_token_is_not_reused_with_another_access_token(monkeypatch):
+    fetched = []
+
+    def fake_fetch(username):
+        fetched.append(username)
+        return {"email": "cognito@example.com", "nickname": "from-cognito"}
+
+    monkeypatch.setattr("app.auth.cognito.fetch_user_attributes", fake_fetch)
+    sys.modules.pop("app.auth.dependencies", None)
+    dependencies = importlib.import_module("app.auth.dependencies")
+    monkeypatch.setattr(dependencies, "get_jwks", lambda: {"keys": [_oct_jwk("test")]})
+    monkeypatch.setattr(dependencies, "AUTH_USE_ID_TOKEN_CLAIMS", True)
+
+    audience = os.environ["COGNITO_APP_CLIENT_ID"]
+    exp = int(time.time()) + 300
+
+    def access_token(jti):
+        return jwt.encode(
+            {"sub": "u1", "username": "u1", "aud": audience, "exp": exp, "jti": jti},
+            "secret",
+            algorithm="HS256",
+            headers={"kid": "test"},
+        )
+
+    bound_to = access_token("first")
+    id_token = jwt.encode(
+        {"sub": "u1", "aud": audience, "exp": exp, "token_use": "id",
+         "email": "u1@example.com", "nickname": "nick"},
+        "secret",
+        algorithm="HS256",
+        headers={"kid": "test"},
+        access_token=bound_to,
+    )
+
+    def user_for(credentials):
+        request = Request(
+            scope={
+                "type": "http",
+                "headers": [
+                    (b"authorization", f"Bearer {credentials}".encode()),
+                    (b"cookie", f"id_token={id_token}".encode()),
+                ],
+            }
+        )
+        return asyncio.run(dependencies.get_current_user(request))
+
+    assert user_for(bound_to)["attributes"]["nickname"] == "nick"
+    assert user_for(access_token("second"))["attributes"]["nickname"] == "from-cognito"
+    assert fetched == ["u1"]
+
+
+def test_saturated_pool_during_jwks_fetch_is_a_503(monkeypatch):
+    import app.main as main_module
+
+    dependencies = main_module.auth_dependencies
+    monkeypatch.setattr(dependencies, "jwks_store", dependencies.JWKSKeyStore(
+        lambda: {"keys": [_oct_jwk("test")]}, ttl_seconds=3600, min_refetch_seconds=30
+    ))
+
+    async def saturated(func, *args, **kwargs):
+        raise dependencies.BlockingPoolSaturatedError("Blocking I/O pool is saturated")
+
+    monkeypatch.setattr(dependencies, "run_blocking", saturated)
+    token = jwt.encode(
+        {"sub": "u1", "username": "u1", "aud": os.environ["COGNITO_APP_CLIENT_ID"]},
+        "secret",
+        algorithm="HS256",
+        headers={"kid": "test"},
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(dependencies.get_current_user(_bearer_request(token)))
+
+    assert exc_info.value.status_code == 503
@@ -1,6 +1,11 @@
+import asyncio
+import dataclasses
+import io
 import os
+import threading
 
 import pytest
+from boto3.dynamodb.conditions import Key
 from fastapi.testclient import TestClient
 
 os.environ.setdefault("AWS_REGION", "eu-west-2")
@@ -12,9 +17,12 @@ os.environ.setdefault("COGNITO_AUTH_URL_BASE", "https://example.com/login")
 os.environ.setdefault("COGNITO_SCOPE", "openid+profile")
 
 from app.csrf import CSRF_COOKIE  # noqa: E402
+from app.executor import BlockingIOPool, BlockingPoolSaturatedError  # noqa: E402
 from app.main import app  # noqa: E402
 from app.routes import matches as matches_routes  # noqa: E402
+from app.services import match_import  # noqa: E402
 from app.services import matches as match_service  # noqa: E402
+from fake_dynamodb import FakeDynamoDBTable  # noqa: E402
 
 client = TestClient(app)
 
@@ -76,7 +84,7 @@ def test_match_create_redirects_and_appears_in_list(authenticated_user):
         "/matches",
         data={
             "title": "After school five-a-side",
-            "starts_at": "2026-06-01T16:00",
+            "starts_at": "2030-06-01T16:00",
             "location": "Park pitch",
             "class_from": "2",
             "class_to": "4",
@@ -136,13 +144,10 @@ def test_matches_page_reports_unconfigured_storage(monkeypatch, authenticated_us
 def test_match_create_reports_storage_failure(monkeypatch, authenticated_user):
     get_resp = client.get("/matches", headers={"Authorization": "Bearer t"})
     csrf_token = get_resp.cookies.get(CSRF_COOKIE)
-    monkeypatch.setattr(
-        matches_routes,
-        "create_match",
-        lambda **kwargs: (_ for _ in ()).throw(
-            match_service.MatchStorageError("Unable to save match")
-        ),
-    )
+    async def failing_create(**kwargs):
+        raise match_service.MatchStorageError("Unable to save match")
+
+    monkeypatch.setattr(matches_routes, "create_match_async", failing_create)
 
     resp = client.post(
         "/matches",
@@ -163,17 +168,7 @@ def test_match_create_reports_storage_failure(monkeypatch, authenticated_user):
 
 
 def test_dynamodb_repository_stores_match_items():
-    class FakeTable:
-        def __init__(self):
-            self.items = []
-
-        def put_item(self, Item):
-            self.items.append(Item)
-
-        def query(self, **kwargs):
-            return {"Items": self.items}
-
-    table = FakeTable()
+    table = FakeDynamoDBTable()
     repository = match_service.DynamoDBMatchRepository(table)
     match = match_service.Match(
         id="",
@@ -192,10 +187,11 @@ def test_dynamodb_repository_stores_match_items():
 
     assert created.id
     assert listed == [created]
-    assert table.items[0]["PK"] == "MATCH"
-    assert table.items[0]["SK"] == f"START#2026-06-01T16:00:00#{created.id}"
-    assert table.items[0]["GSI1PK"] == "USER#u1"
-    assert table.items[0]["GSI1SK"] == table.items[0]["SK"]
+    [item] = table.stored_items
+    assert item["PK"] == "MATCH"
+    assert item["SK"] == f"START#2026-06-01T16:00:00#{created.id}"
+    assert item["GSI1PK"] == "USER#u1"
+    assert item["GSI1SK"] == item["SK"]
 
 
 def test_match_repository_requires_explicit_backend(monkeypatch):
@@ -208,3 +204,641 @@ def test_match_repository_requires_explicit_backend(monkeypatch):
         match="Match storage is not configured",
     ):
         match_service.get_match_repository()
+
+
+def _new_match(title, starts_at, creator_sub="u1"):
+    return match_service.Match(
+        id="",
+        creator_sub=creator_sub,
+        title=title,
+        starts_at=match_service.datetime.fromisoformat(starts_at),
+        location="Park pitch",
+        class_from="2",
+        class_to="4",
+        max_players=10,
+        notes="",
+    )
+
+
+@pytest.mark.parametrize("repository_factory", [
+    match_service.InMemoryMatchRepository,
+    lambda: match_service.DynamoDBMatchRepository(FakeDynamoDBTable(max_page_items=2)),
+    lambda: match_service.DynamoDBMatchRepository(FakeDynamoDBTable(), shard_count=3),
+])
+def test_repository_pages_forward_and_back(repository_factory):
+    repository = repository_factory()
+    for day in range(1, 6):
+        repository.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00"))
+
+    first = repository.list_page(2)
+    second = repository.list_page(2, first.next_cursor)
+    third = repository.list_page(2, second.next_cursor)
+    back = repository.list_page(2, third.previous_cursor)
+
+    assert [match.title for match in first.items] == ["Match 1", "Match 2"]
+    assert first.previous_cursor is None
+    assert [match.title for match in second.items] == ["Match 3", "Match 4"]
+    assert [match.title for match in third.items] == ["Match 5"]
+    assert third.next_cursor is None
+    assert [match.title for match in back.items] == ["Match 3", "Match 4"]
+    assert back.next_cursor and back.previous_cursor
+
+
+def test_dynamodb_repository_follows_last_evaluated_key():
+    table = FakeDynamoDBTable(max_page_items=2)
+    repository = match_service.DynamoDBMatchRepository(table)
+    for day in range(1, 6):
+        repository.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00"))
+
+    assert len(repository.list()) == 5
+    assert table.queries == 3
+
+
+def test_tampered_cursor_is_rejected():
+    cursor = match_service.encode_cursor("after", "START#2030-06-01T16:00:00#1")
+    signature = cursor.partition(".")[2]
+    forged = match_service.encode_cursor("after", "START#1999").partition(".")[0]
+
+    with pytest.raises(match_service.InvalidCursorError):
+        match_service.decode_cursor(f"{forged}.{signature}")
+    assert match_service.decode_cursor(cursor).sort_key.endswith("#1")
+
+
+def test_matches_page_links_to_next_page(monkeypatch, authenticated_user):
+    monkeypatch.setattr(matches_routes, "MATCHES_PAGE_SIZE", 1)
+    repository = match_service.InMemoryMatchRepository()
+    match_service.set_match_repository(repository)
+    repository.create(_new_match("Early game", "2030-06-01T16:00"))
+    repository.create(_new_match("Late game", "2030-06-02T16:00"))
+
+    first = client.get("/matches", headers={"Authorization": "Bearer t"})
+    next_cursor = repository.list_page(1).next_cursor
+    second = client.get("/matches", params={"cursor": next_cursor},
+                        headers={"Authorization": "Bearer t"})
+
+    assert "Early game" in first.text and "Late game" not in first.text
+    assert "Next" in first.text
+    assert "Late game" in second.text and "Previous" in second.text
+
+
+def test_matches_page_rejects_invalid_cursor(authenticated_user):
+    resp = client.get("/matches", params={"cursor": "nope"},
+                      headers={"Authorization": "Bearer t"})
+
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("repository_factory", [
+    match_service.InMemoryMatchRepository,
+    lambda: match_service.DynamoDBMatchRepository(FakeDynamoDBTable(max_page_items=2)),
+    lambda: match_service.DynamoDBMatchRepository(FakeDynamoDBTable(), shard_count=3),
+])
+def test_repository_lists_matches_in_time_window(repository_factory):
+    repository = repository_factory()
+    for day in range(1, 6):
+        repository.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00"))
+
+    upcoming = repository.list_upcoming(
+        match_service.datetime.fromisoformat("2030-06-02T16:00"),
+        match_service.datetime.fromisoformat("2030-06-04T16:00"),
+    )
+    page = repository.list_page(
+        1, since=match_service.datetime.fromisoformat("2030-06-04T00:00")
+    )
+    last = repository.list_page(1, page.next_cursor)
+
+    assert [match.title for match in upcoming] == ["Match 2", "Match 3"]
+    assert [match.title for match in page.items] == ["Match 4"]
+    assert [match.title for match in last.items] == ["Match 5"]
+
+
+@pytest.mark.parametrize("repository_factory", [
+    match_service.InMemoryMatchRepository,
+    lambda: match_service.DynamoDBMatchRepository(FakeDynamoDBTable()),
+    lambda: match_service.DynamoDBMatchRepository(FakeDynamoDBTable(), shard_count=3),
+])
+def test_cursor_keeps_its_window_after_the_clock_moves(repository_factory):
+    repository = repository_factory()
+    for day in range(1, 6):
+        repository.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00"))
+    since = match_service.datetime.fromisoformat("2030-06-01T00:00")
+    first = repository.list_page(2, since=since)
+    second = repository.list_page(2, first.next_cursor)
+    # By the time the links are followed, "now" is past every cursor's key.
+    later = match_service.datetime.fromisoformat("2030-06-05T00:00")
+
+    back = repository.list_page(2, second.previous_cursor, since=later)
+    third = repository.list_page(2, second.next_cursor, since=later)
+    legacy_before = match_service.encode_cursor("before", second.items[0].sort_key)
+    legacy_after = match_service.encode_cursor("after", first.items[-1].sort_key)
+
+    assert [match.title for match in back.items] == ["Match 1", "Match 2"]
+    assert [match.title for match in third.items] == ["Match 5"]
+    assert repository.list_page(2, legacy_before, since=later).items == []
+    assert [
+        match.title for match in repository.list_page(2, legacy_after, since=later).items
+    ] == ["Match 5"]
+
+
+def test_matches_page_hides_past_matches_by_default(authenticated_user):
+    repository = match_service.InMemoryMatchRepository()
+    match_service.set_match_repository(repository)
+    repository.create(_new_match("Old game", "2020-06-01T16:00"))
+    repository.create(_new_match("Future game", "2030-06-01T16:00"))
+
+    upcoming = client.get("/matches", headers={"Authorization": "Bearer t"})
+    everything = client.get("/matches", params={"include_past": "true"},
+                            headers={"Authorization": "Bearer t"})
+
+    assert "Future game" in upcoming.text and "Old game" not in upcoming.text
+    assert "Old game" in everything.text
+
+
+def test_sharded_repository_merges_shards_in_order():
+    table = FakeDynamoDBTable(max_page_items=2)
+    repository = match_service.DynamoDBMatchRepository(table, shard_count=4)
+    for day in range(1, 10):
+        repository.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00"))
+
+    first = repository.list_page(3)
+    second = repository.list_page(3, first.next_cursor)
+    back = repository.list_page(3, second.previous_cursor)
+
+    assert len({item["PK"] for item in table.stored_items}) > 1
+    assert all(item["PK"].startswith("MATCH#") for item in table.stored_items)
+    assert [match.title for match in repository.list()] == [f"Match {day}" for day in range(1, 10)]
+    assert [match.title for match in second.items] == ["Match 4", "Match 5", "Match 6"]
+    assert [match.title for match in back.items] == ["Match 1", "Match 2", "Match 3"]
+
+
+def test_sharded_repository_migrates_legacy_partition():
+    table = FakeDynamoDBTable(max_page_items=2)
+    legacy = match_service.DynamoDBMatchRepository(table)
+    for day in range(1, 6):
+        legacy.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00"))
+    sharded = match_service.DynamoDBMatchRepository(
+        table, shard_count=3, read_legacy_partition=True
+    )
+    sharded.create(_new_match("Match 6", "2030-06-06T16:00"))
+
+    before = [match.title for match in sharded.list()]
+    moved = sharded.migrate_to_shards()
+    sharded.read_legacy_partition = False
+
+    assert before == [f"Match {day}" for day in range(1, 7)]
+    assert moved == 5
+    assert not any(item["PK"] == "MATCH" for item in table.stored_items)
+    assert [match.title for match in sharded.list()] == before
+
+
+def test_shard_migration_writes_each_page_before_reading_the_next():
+    events = []
+
+    class RecordingTable(FakeDynamoDBTable):
+        def query(self, **kwargs):
+            events.append("query")
+            return super().query(**kwargs)
+
+        def delete_item(self, Key):
+            events.append("delete")
+            return super().delete_item(Key=Key)
+
+    table = RecordingTable(max_page_items=2)
+    legacy = match_service.DynamoDBMatchRepository(table)
+    for day in range(1, 6):
+        legacy.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00"))
+
+    moved = match_service.DynamoDBMatchRepository(table, shard_count=3).migrate_to_shards()
+
+    assert moved == 5
+    assert events == ["query", "delete", "delete"] * 2 + ["query", "delete"]
+
+
+@pytest.mark.parametrize("repository_factory", [
+    match_service.InMemoryMatchRepository,
+    lambda: match_service.DynamoDBMatchRepository(
+        FakeDynamoDBTable(max_page_items=2), shard_count=2
+    ),
+    lambda: match_service.DynamoDBMatchRepository(FakeDynamoDBTable(), shard_count=2),
+])
+def test_repository_lists_matches_by_creator(repository_factory):
+    repository = repository_factory()
+    for day in range(1, 6):
+        creator = "u1" if day % 2 else "u2"
+        repository.create(_new_match(f"Match {day}", f"2030-06-0{day}T16:00", creator))
+
+    first = repository.list_by_creator("u1", 2)
+    second = repository.list_by_creator("u1", 2, first.next_cursor)
+
+    assert [match.title for match in first.items] == ["Match 1", "Match 3"]
+    assert [match.title for match in second.items] == ["Match 5"]
+    assert second.next_cursor is None
+    assert repository.list_by_creator("nobody", 2).items == []
+
+
+def test_my_matches_page_lists_only_own_matches(authenticated_user):
+    repository = match_service.InMemoryMatchRepository()
+    match_service.set_match_repository(repository)
+    repository.create(_new_match("Mine", "2030-06-01T16:00", "u1"))
+    repository.create(_new_match("Someone else's", "2030-06-02T16:00", "u2"))
+
+    resp = client.get("/matches/mine", headers={"Authorization": "Bearer t"})
+
+    assert resp.status_code == 200
+    assert "Mine" in resp.text
+    assert "Someone else&#39;s" not in resp.text
+
+
+class FlakyRepository(match_service.InMemoryMatchRepository):
+    def __init__(self):
+        super().__init__()
+        self.fail = False
+        self.list_calls = 0
+
+    def list(self):
+        self.list_calls += 1
+        if self.fail:
+            raise match_service.MatchStorageError("Unable to load matches")
+        return super().list()
+
+    def list_page(self, limit, cursor=None, *, since=None, until=None):
+        if self.fail:
+            raise match_service.MatchStorageError("Unable to load matches")
+        return super().list_page(limit, cursor, since=since, until=until)
+
+
+def test_cached_repository_invalidates_on_create():
+    backend = FlakyRepository()
+    clock = iter(range(1000)).__next__
+    repository = match_service.CachedMatchRepository(backend, ttl_seconds=10, clock=clock)
+
+    repository.list()
+    repository.list()
+    repository.create(_new_match("New game", "2030-06-01T16:00"))
+    listed = repository.list()
+
+    assert [match.title for match in listed] == ["New game"]
+    assert backend.list_calls == 2
+    assert repository.stats()["hits"] == 1
+    assert repository.stats()["misses"] == 2
+
+
+def test_cached_repository_serves_stale_result_on_storage_error():
+    backend = FlakyRepository()
+    backend.create(_new_match("Cached game", "2030-06-01T16:00"))
+    now = [0.0]
+    repository = match_service.CachedMatchRepository(
+        backend, ttl_seconds=5, stale_if_error_seconds=60, clock=lambda: now[0]
+    )
+    repository.list()
+    backend.fail = True
+
+    now[0] = 30.0
+    stale = repository.list()
+    now[0] = 100.0
+
+    assert [match.title for match in stale] == ["Cached game"]
+    assert repository.stats()["errors_served_stale"] == 1
+    with pytest.raises(match_service.MatchStorageError):
+        repository.list()
+
+
+def test_cached_repository_serves_stale_page_after_since_moves_on():
+    backend = FlakyRepository()
+    backend.create(_new_match("Cached game", "2030-06-01T16:00"))
+    now = [0.0]
+    repository = match_service.CachedMatchRepository(
+        backend, ttl_seconds=5, stale_if_error_seconds=300, clock=lambda: now[0]
+    )
+    repository.list_page(20, since=match_service.datetime.fromisoformat("2030-01-01T10:00"))
+    backend.fail = True
+
+    now[0] = 90.0
+    stale = repository.list_page(
+        20, since=match_service.datetime.fromisoformat("2030-01-01T10:01")
+    )
+
+    assert [match.title for match in stale.items] == ["Cached game"]
+    assert repository.stats()["errors_served_stale"] == 1
+
+
+def test_cached_repository_revalidates_stale_entries_in_background():
+    backend = FlakyRepository()
+    now = [0.0]
+    repository = match_service.CachedMatchRepository(
+        backend, ttl_seconds=5, stale_seconds=30, clock=lambda: now[0]
+    )
+    repository.list()
+    backend.create(_new_match("Late arrival", "2030-06-01T16:00"))
+
+    now[0] = 10.0
+    stale = repository.list()
+    for _ in range(100):
+        if not repository._refreshing:
+            break
+        match_service.time.sleep(0.01)
+    fresh = repository.list()
+
+    assert stale == []
+    assert [match.title for match in fresh] == ["Late arrival"]
+    assert repository.stats()["stale_hits"] == 1
+
+
+def test_in_memory_repository_keeps_indexes_sorted(monkeypatch):
+    monkeypatch.setattr(match_service._SortedIndex, "CHUNK_SIZE", 2)
+    repository = match_service.InMemoryMatchRepository()
+    days = [7, 3, 9, 1, 5, 8, 2, 6, 4]
+    for day in days:
+        match = _new_match(f"Match {day}", f"2030-06-0{day}T16:00", f"u{day % 2}")
+        repository.create(dataclasses.replace(
+            match, class_from="reception", class_to="1" if day < 5 else "reception"
+        ))
+
+    titles = [match.title for match in repository.list()]
+    pages, cursor = [], None
+    while True:
+        page = repository.list_page(2, cursor)
+        pages.extend(match.title for match in page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    backwards = repository.list_page(2, page.previous_cursor)
+
+    assert titles == [f"Match {day}" for day in sorted(days)]
+    assert pages == titles
+    assert [match.title for match in backwards.items] == ["Match 7", "Match 8"]
+    assert [match.title for match in repository.list_by_class("1")] == [
+        "Match 1", "Match 2", "Match 3", "Match 4"
+    ]
+    assert [match.title for match in repository.list_by_creator("u1", 10).items] == [
+        "Match 1", "Match 3", "Match 5", "Match 7", "Match 9"
+    ]
+
+
+def test_blocking_pool_rejects_work_beyond_queue_depth():
+    pool = BlockingIOPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(BlockingPoolSaturatedError):
+            await pool.run(lambda: None)
+        release.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(scenario())
+
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["pending"] == 0
+
+
+def test_blocking_pool_holds_slot_until_cancelled_call_finishes():
+    pool = BlockingIOPool(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+        # The cancelled call is still blocking the only thread.
+        with pytest.raises(BlockingPoolSaturatedError):
+            await pool.run(lambda: None)
+        release.set()
+        while pool.stats()["pending"]:
+            await asyncio.sleep(0.01)
+        await pool.run(lambda: None)
+
+    asyncio.run(scenario())
+
+    assert pool.stats() | {"max_workers": 1} == {
+        "max_workers": 1, "max_queue": 0, "pending": 0, "completed": 2, "rejected": 1
+    }
+
+
+def test_dynamodb_create_many_retries_unprocessed_items():
+    table = FakeDynamoDBTable(unprocessed_batches=2)
+    repository = match_service.DynamoDBMatchRepository(table)
+    repository.sleep = lambda seconds: None
+    matches = [_new_match(f"Match {n}", f"2030-06-01T16:{n:02d}") for n in range(30)]
+
+    result = repository.create_many(matches)
+
+    assert len(result.created) == 30
+    assert result.failed == []
+    assert len(table) == 30
+    assert table.batch_writes == 4
+    assert [match.title for match in repository.list()][:2] == ["Match 0", "Match 1"]
+
+
+def test_dynamodb_create_many_reports_items_never_written(monkeypatch):
+    monkeypatch.setattr(match_service, "BATCH_WRITE_MAX_ATTEMPTS", 2)
+    table = FakeDynamoDBTable(unprocessed_batches=2)
+    repository = match_service.DynamoDBMatchRepository(table)
+    repository.sleep = lambda seconds: None
+
+    result = repository.create_many(
+        [_new_match(f"Match {n}", f"2030-06-01T1{n}:00") for n in range(4)]
+    )
+
+    assert len(result.created) == 2
+    assert result.failed == [2, 3]
+
+
+def test_import_matches_streams_rows_and_reports_errors():
+    rows = io.StringIO(
+        "title,starts_at,location,class_from,class_to,max_players,notes\n"
+        "Cup game,2030-06-01T16:00,Park pitch,2,4,10,Bring water\n"
+        "Backwards,2030-06-02T16:00,Park pitch,4,2,10,\n"
+        ",2030-06-03T16:00,Park pitch,2,4,10,\n"
+        "Friendly,2030-06-04T16:00,Rec ground,reception,1,8,\n"
+    )
+    jsonl = io.StringIO(
+        '{"title": "Late game", "starts_at": "2030-06-05T16:00", "location": "Park",'
+        ' "class_from": "3", "class_to": "3", "max_players": 12}\n'
+        "not json\n"
+    )
+
+    csv_result = match_import.import_matches(match_import.read_csv_rows(rows), creator_sub="u1")
+    jsonl_result = match_import.import_matches(
+        match_import.read_jsonl_rows(jsonl), creator_sub="u1"
+    )
+
+    assert csv_result.created == 2
+    assert [(error.row, error.message) for error in csv_result.errors] == [
+        (2, "Class range start must not be after the end"),
+        (3, "Missing columns: title"),
+    ]
+    assert jsonl_result.created == 1
+    assert jsonl_result.errors[0].row == 2
+    assert [match.title for match in match_service.list_matches()] == [
+        "Cup game", "Friendly", "Late game"
+    ]
+
+
+def test_import_matches_reports_progress_when_storage_fails(monkeypatch):
+    class FailingRepository(match_service.InMemoryMatchRepository):
+        def create_many(self, matches):
+            if len(self.list()) >= 2:
+                raise match_service.MatchStorageError("Unable to save matches")
+            return super().create_many(matches)
+
+    match_service.set_match_repository(FailingRepository())
+    monkeypatch.setattr(match_import, "IMPORT_CHUNK_SIZE", 2)
+    rows = [
+        {"title": f"Game {n}", "starts_at": f"2030-06-0{n}T16:00", "location": "Park",
+         "class_from": "2", "class_to": "4", "max_players": "10"}
+        for n in range(1, 6)
+    ]
+
+    with pytest.raises(match_import.MatchImportError) as exc_info:
+        match_import.import_matches(rows, creator_sub="u1")
+
+    assert exc_info.value.result.created == 2
+    assert exc_info.value.row == 3
+
+
+def test_dynamodb_list_page_reads_projected_summaries():
+    table = FakeDynamoDBTable()
+    repository = match_service.DynamoDBMatchRepository(table)
+    created = repository.create(_new_match("Projected", "2030-06-01T16:00"))
+
+    page = repository.list_page(10)
+
+    [summary] = page.items
+    assert isinstance(summary, match_service.MatchSummary)
+    assert summary.id == created.id
+    assert summary.sort_key == created.sort_key
+    assert summary._starts_at is None
+    assert summary.starts_at_label == created.starts_at_label
+    assert summary.class_range_label == "Year 2 to Year 4"
+    assert not hasattr(summary, "creator_sub")
+    assert not hasattr(created, "__dict__")
+
+
+def test_fake_table_pages_at_one_megabyte_and_supports_key_conditions():
+    table = FakeDynamoDBTable()
+    padding = "x" * 200_000
+    for number in range(8):
+        table.put_item(Item={"PK": "P", "SK": f"A#{number}", "GSI1PK": "G", "GSI1SK": "S",
+                             "blob": padding})
+    table.put_item(Item={"PK": "P", "SK": "B#0"})
+
+    first = table.query(KeyConditionExpression=Key("PK").eq("P") & Key("SK").begins_with("A#"))
+    rest = table.query(
+        KeyConditionExpression=Key("PK").eq("P") & Key("SK").begins_with("A#"),
+        ExclusiveStartKey=first["LastEvaluatedKey"],
+    )
+    backwards = table.query(
+        KeyConditionExpression=Key("PK").eq("P") & Key("SK").lt("A#3"),
+        ScanIndexForward=False,
+        Limit=2,
+        ProjectionExpression="#sk",
+        ExpressionAttributeNames={"#sk": "SK"},
+    )
+    by_index = table.query(IndexName="GSI1", KeyConditionExpression=Key("GSI1PK").eq("G"), Limit=3)
+
+    assert [item["SK"] for item in first["Items"]] == [f"A#{number}" for number in range(5)]
+    assert [item["SK"] for item in rest["Items"]] == ["A#5", "A#6", "A#7"]
+    assert "LastEvaluatedKey" not in rest
+    assert backwards["Items"] == [{"SK": "A#2"}, {"SK": "A#1"}]
+    assert backwards["LastEvaluatedKey"] == {"PK": "P", "SK": "A#1"}
+    assert [item["SK"] for item in by_index["Items"]] == ["A#0", "A#1", "A#2"]
+    assert by_index["LastEvaluatedKey"] == {"PK": "P", "SK": "A#2", "GSI1PK": "G", "GSI1SK": "S"}
+
+
+def test_fake_table_rejects_start_key_outside_key_condition():
+    table = FakeDynamoDBTable()
+    for day in range(1, 4):
+        table.put_item(Item={"PK": "P", "SK": f"START#2030-06-0{day}"})
+    window = Key("PK").eq("P") & Key("SK").between("START#2030-06-02", "START$")
+
+    inside = table.query(
+        KeyConditionExpression=window,
+        ExclusiveStartKey={"PK": "P", "SK": "START#2030-06-02"},
+    )
+    with pytest.raises(match_service.ClientError) as exc_info:
+        table.query(
+            KeyConditionExpression=window,
+            ExclusiveStartKey={"PK": "P", "SK": "START#2030-06-01"},
+        )
+
+    assert [item["SK"] for item in inside["Items"]] == ["START#2030-06-03"]
+    assert exc_info.value.response["Error"]["Code"] == "ValidationException"
+
+
+def test_dynamodb_repository_round_trips_through_fake_table():
+    table = FakeDynamoDBTable()
+    repository = match_service.DynamoDBMatchRepository(table, shard_count=4)
+    outcome = repository.create_many(
+        [_new_match(f"Match {minute}", f"2030-06-01T16:{minute:02d}") for minute in range(40)]
+    )
+
+    titles = [match.title for match in repository.list()]
+    page = repository.list_page(30)
+    tail = repository.list_page(30, page.next_cursor)
+
+    assert len(outcome.created) == len(table) == 40
+    assert titles == [f"Match {minute}" for minute in range(40)]
+    assert [match.title for match in page.items + tail.items] == titles
+    assert tail.next_cursor is None
+
+
+def test_templates_are_precompiled_into_the_bytecode_cache(monkeypatch, tmp_path):
+    from jinja2 import FileSystemBytecodeCache
+
+    from app.jinja2_env import BASE_DIR, precompile_templates, templates
+
+    env = templates.env
+    monkeypatch.setattr(env, "bytecode_cache", FileSystemBytecodeCache(str(tmp_path)))
+    env.cache.clear()
+
+    compiled = precompile_templates()
+
+    assert compiled == len(list((BASE_DIR / "templates").rglob("*.html")))
+    assert len(list(tmp_path.iterdir())) == compiled
+    # Another worker's environment loads the cached bytecode instead of compiling.
+    env.cache.clear()
+    monkeypatch.setattr(env, "compile", lambda *args, **kwargs: pytest.fail("compiled again"))
+    assert precompile_templates() == compiled
+
+
+def test_bytecode_cache_creates_its_directory_or_is_disabled(tmp_path):
+    from app.jinja2_env import _bytecode_cache
+
+    blocked = tmp_path / "not-a-directory"
+    blocked.write_text("")
+
+    assert _bytecode_cache(str(tmp_path / "jinja" / "cache")) is not None
+    assert (tmp_path / "jinja" / "cache").is_dir()
+    assert _bytecode_cache(str(blocked / "cache")) is None
+
+
+def test_match_cards_are_rendered_once_and_reused(monkeypatch, authenticated_user):
+    from app.jinja2_env import match_card_cache, render_match_cards
+
+    repository = match_service.InMemoryMatchRepository()
+    match_service.set_match_repository(repository)
+    created = repository.create(_new_match("Five-a-side", "2030-06-01T16:00", "u1"))
+    repository.create(_new_match("Kickabout <b>", "2030-06-02T16:00", "u2"))
+    match_card_cache.clear()
+    labels = []
+    real_label = match_service.Match.starts_at_label
+    monkeypatch.setattr(
+        match_service.Match,
+        "starts_at_label",
+        property(lambda match: labels.append(match.id) or real_label.fget(match)),
+    )
+
+    first = client.get("/matches", headers={"Authorization": "Bearer t"})
+    second = client.get("/matches", headers={"Authorization": "Bearer t"})
+
+    assert first.status_code == second.status_code == 200
+    assert "Five-a-side" in second.text
+    assert "Kickabout &lt;b&gt;" in second.text
+    assert len(labels) == 2
+    # An edited match has a new card key, so its card is rendered again.
+    edited = render_match_cards([dataclasses.replace(created, title="Renamed")])
+    assert "Renamed" in edited
+    assert len(labels) == 3
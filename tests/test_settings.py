@@ -1,4 +1,7 @@
+import asyncio
 import os
+import threading
+import time
 
 import pytest
 from fastapi.testclient import TestClient
@@ -29,18 +32,28 @@ def reset_app_state(monkeypatch):
 
 
 @pytest.fixture
-def authenticated_user():
+def authenticated_user(monkeypatch):
+    user = {"sub": "u1", "username": "u1", "attributes": {}}
+
+    async def fake_current_user(request=None):
+        return dict(user)
+
     app.dependency_overrides[settings_routes.get_current_user] = (
-        lambda token=None, request=None: {"sub": "u1", "username": "u1", "attributes": {}}
+        lambda token=None, request=None: dict(user)
+    )
+    app.dependency_overrides[settings_routes.get_verified_claims] = (
+        lambda request=None: {"sub": "u1", "username": "u1"}
+    )
+    monkeypatch.setattr(
+        settings_routes.auth_dependencies, "get_current_user", fake_current_user
     )
 
 
 def test_settings_page_sets_csrf_cookie(monkeypatch, authenticated_user):
-    monkeypatch.setattr(
-        settings_routes,
-        "fetch_user_settings",
-        lambda sub: {"nickname": "nick", "preferred_class": "1"},
-    )
+    async def fake_fetch(sub):
+        return {"nickname": "nick", "preferred_class": "1"}
+
+    monkeypatch.setattr(settings_routes, "fetch_user_settings_async", fake_fetch)
 
     resp = client.get("/settings", headers={"Authorization": "Bearer t"})
     csrf_token = resp.cookies.get(CSRF_COOKIE)
@@ -55,6 +68,84 @@ def test_settings_page_sets_csrf_cookie(monkeypatch, authenticated_user):
     assert "SameSite=lax" in set_cookie_header
 
 
+def test_settings_page_fetches_user_and_settings_concurrently(monkeypatch, authenticated_user):
+    started = []
+    both_started = asyncio.Event()
+
+    async def wait_for_both(name, value):
+        started.append(name)
+        if len(started) == 2:
+            both_started.set()
+        # Only finishes if the other call has started too, i.e. they overlap.
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        return value
+
+    monkeypatch.setattr(
+        settings_routes.auth_dependencies,
+        "get_current_user",
+        lambda request: wait_for_both(
+            "user", {"sub": "u1", "username": "u1", "attributes": {"nickname": "n"}}
+        ),
+    )
+    monkeypatch.setattr(
+        settings_routes,
+        "fetch_user_settings_async",
+        lambda sub: wait_for_both("settings", {"nickname": "Saved", "preferred_class": "3"}),
+    )
+
+    resp = client.get("/settings", headers={"Authorization": "Bearer t"})
+
+    assert resp.status_code == 200
+    assert sorted(started) == ["settings", "user"]
+    assert 'value="Saved"' in resp.text
+
+
+def test_settings_page_renders_when_settings_time_out(monkeypatch, authenticated_user):
+    async def slow_fetch(sub):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(settings_routes, "fetch_user_settings_async", slow_fetch)
+    monkeypatch.setattr(settings_routes, "USER_SETTINGS_TIMEOUT_SECONDS", 0.01)
+
+    resp = client.get("/settings", headers={"Authorization": "Bearer t"})
+
+    assert resp.status_code == 200
+    assert 'name="nickname" maxlength="30" value=""' in resp.text
+
+
+def test_fan_out_cancels_the_rest_when_a_required_call_fails():
+    from fastapi import HTTPException
+
+    from app.fanout import Upstream, fan_out
+
+    cancelled = []
+
+    async def unauthorized():
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def scenario():
+        with pytest.raises(HTTPException) as exc_info:
+            await fan_out(
+                Upstream("user", unauthorized, timeout=1),
+                Upstream("slow", slow, timeout=1, fallback=None),
+            )
+        # fan_out waits for the cancelled calls before it raises.
+        assert cancelled == ["slow"]
+        return exc_info.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 401
+    assert cancelled == ["slow"]
+
+
 def test_settings_post_rejects_missing_csrf(authenticated_user):
     resp = client.post(
         "/settings",
@@ -68,18 +159,16 @@ def test_settings_post_rejects_missing_csrf(authenticated_user):
 def test_settings_post_saves_with_valid_csrf(monkeypatch, authenticated_user):
     saved_settings = []
 
-    monkeypatch.setattr(
-        settings_routes,
-        "fetch_user_settings",
-        lambda sub: {"nickname": "nick", "preferred_class": "1"},
-    )
-    monkeypatch.setattr(
-        settings_routes,
-        "save_user_settings",
-        lambda sub, nickname, preferred_class: saved_settings.append(
-            (sub, nickname, preferred_class)
-        ),
-    )
+    async def fake_fetch(sub):
+        return {"nickname": "nick", "preferred_class": "1"}
+
+    monkeypatch.setattr(settings_routes, "fetch_user_settings_async", fake_fetch)
+    async def fake_save(sub, nickname, preferred_class):
+        saved_settings.append((sub, nickname, preferred_class))
+
+    monkeypatch.setattr(settings_routes, "save_user_settings_async", fake_save)
+    invalidated = []
+    monkeypatch.setattr(settings_routes, "invalidate_user_attributes", invalidated.append)
 
     get_resp = client.get("/settings", headers={"Authorization": "Bearer t"})
     csrf_token = get_resp.cookies.get(CSRF_COOKIE)
@@ -97,3 +186,153 @@ def test_settings_post_saves_with_valid_csrf(monkeypatch, authenticated_user):
     assert post_resp.status_code == 303
     assert post_resp.headers["location"] == "/settings"
     assert saved_settings == [("u1", "Alex", "2")]
+    assert invalidated == ["u1"]
+
+
+def test_http_client_pool_reuses_connections_per_host():
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from app.http_client import HTTPClientPool
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b'{"nickname": "nick"}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pool = HTTPClientPool(pool_size=2, connect_timeout=1, read_timeout=1)
+    url = f"http://127.0.0.1:{server.server_port}/user/u1"
+    try:
+        responses = [pool.request("GET", url).json() for _ in range(3)]
+        stats = pool.stats()["hosts"][f"http://127.0.0.1:{server.server_port}/"]
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+    assert responses == [{"nickname": "nick"}] * 3
+    assert stats == {"requests": 3, "connections_opened": 1, "connections_reused": 2}
+
+
+def test_user_settings_cache_reads_through_and_writes_through(monkeypatch):
+    from app.services import user_settings
+
+    class FakeResponse:
+        def __init__(self, status_code, body=None):
+            self.status_code = status_code
+            self.body = body
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.body
+
+    gets = []
+    responses = {"u1": FakeResponse(200, {"nickname": "nick", "preferred_class": "1"})}
+
+    def fake_get(url, **kwargs):
+        gets.append(url)
+        return responses.get(url.rsplit("/", 1)[-1], FakeResponse(404))
+
+    monkeypatch.setattr(user_settings, "API_GATEWAY_ID", "api")
+    monkeypatch.setattr(user_settings.http_client, "get", fake_get)
+    monkeypatch.setattr(user_settings.http_client, "post", lambda url, **kwargs: FakeResponse(200))
+    user_settings.settings_cache.clear()
+
+    assert user_settings.fetch_user_settings("u1") == {"nickname": "nick", "preferred_class": "1"}
+    assert user_settings.fetch_user_settings("u1")["nickname"] == "nick"
+    assert user_settings.fetch_user_settings("new") == {}
+    assert user_settings.fetch_user_settings("new") == {}
+    assert len(gets) == 2
+
+    user_settings.save_user_settings("u1", "Alex", "2")
+    assert user_settings.cached_user_settings("u1") == {"nickname": "Alex", "preferred_class": "2"}
+    assert user_settings.fetch_user_settings("u1")["nickname"] == "Alex"
+    assert len(gets) == 2
+
+    # The "not found" entry only lives for the shorter missing-settings TTL.
+    later = time.monotonic() + user_settings.USER_SETTINGS_CACHE_MISSING_TTL_SECONDS + 1
+    monkeypatch.setattr(user_settings.settings_cache, "clock", lambda: later)
+    assert user_settings.fetch_user_settings("new") == {}
+    assert user_settings.fetch_user_settings("u1")["nickname"] == "Alex"
+    assert len(gets) == 3
+
+
+def test_circuit_breaker_opens_on_failure_rate_and_probes_half_open():
+    from app.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+    now = [0.0]
+    breaker = CircuitBreaker(
+        "api", failure_rate=0.5, window=4, min_calls=4, open_seconds=30, clock=lambda: now[0]
+    )
+
+    class ServerError(Exception):
+        response = type("Response", (), {"status_code": 503})()
+
+    class NotFound(Exception):
+        response = type("Response", (), {"status_code": 404})()
+
+    def call(exc=None):
+        with breaker.guard():
+            if exc is not None:
+                raise exc
+
+    call()
+    for exc in (NotFound(), ServerError(), ServerError()):
+        with pytest.raises(type(exc)):
+            call(exc)
+    # Two 5xx out of four calls reaches the 50% threshold; 404s do not count.
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        call()
+
+    now[0] = 31
+    assert breaker.state == "half_open"
+    with pytest.raises(ServerError):
+        call(ServerError())
+    assert breaker.state == "open"
+
+    now[0] = 62
+    call()
+    assert breaker.stats() == {
+        "state": "closed",
+        "recent_calls": 1,
+        "recent_failures": 0,
+        "opened": 2,
+        "rejected": 1,
+    }
+
+
+def test_settings_page_skips_settings_api_while_its_circuit_is_open(
+    monkeypatch, authenticated_user
+):
+    from app.circuit_breaker import CircuitBreaker
+    from app.services import user_settings
+
+    breaker = CircuitBreaker(
+        "user_settings_api", failure_rate=1, window=1, min_calls=1, open_seconds=60
+    )
+    breaker.record_failure()
+    calls = []
+    monkeypatch.setattr(user_settings, "settings_breaker", breaker)
+    monkeypatch.setattr(user_settings.http_client, "get", lambda *a, **k: calls.append(a))
+    user_settings.settings_cache.clear()
+
+    resp = client.get("/settings", headers={"Authorization": "Bearer t"})
+
+    assert resp.status_code == 200
+    assert 'name="nickname" maxlength="30" value=""' in resp.text
+    assert calls == []
+    assert breaker.stats()["rejected"] == 1